@@ -1,13 +1,13 @@
 import streamlit as st
 import pandas as pd
 import os
+from assets import inject_css, thumbnail
 
 def display_profile_photo(photo_path, width=150, shape="circle"):
     """Helper function to display profile photos with consistent styling"""
     if os.path.exists(photo_path):
-        if shape == "square":
-            st.markdown(f'<style>.square-photo {{ border: 3px solid #00008B; }} </style>', unsafe_allow_html=True)
-        st.image(photo_path, width=width, use_container_width=False)
+        # Cached thumbnail at the display size instead of the full-size original
+        st.image(thumbnail(photo_path, width=width), width=width, use_container_width=False)
     else:
         st.markdown("<h1 style='text-align: center;'>👤</h1>", unsafe_allow_html=True)
         st.caption(f"Photo not found: {photo_path}")
@@ -224,22 +224,8 @@ def render(df, df_raw, selected_year):
     with st.container(border=True):
         st.markdown("### 👨‍🎓 Research Team")
         
-        # Add CSS for uniform photo sizing and column heights
-        st.markdown("""
-        <style>
-        [data-testid="stImage"] {
-            width: 150px !important;
-            height: 150px !important;
-            object-fit: cover;
-            display: block;
-            margin-left: auto !important;
-            margin-right: auto !important;
-        }
-        [data-testid="column"] {
-            min-height: 750px;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        # Uniform photo sizing and column heights
+        inject_css("aboutus.css")
         
         col1, col2, col3 = st.columns(3, gap="medium")
         
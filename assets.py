@@ -0,0 +1,77 @@
+import io
+import os
+import re
+
+import streamlit as st
+from PIL import Image, ImageOps, features
+
+# -----------------------------
+# Stylesheets: read and minified once per file version, then emitted as a
+# single <style> element per rerun
+# -----------------------------
+# Comments (dropped) and quoted strings / url() (kept verbatim)
+_CSS_TOKENS = re.compile(r"""/\*.*?\*/|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\([^)]*\)""", re.S)
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    verbatim = []
+
+    def hold(token):
+        if token.group().startswith("/*"):
+            return ""
+        verbatim.append(token.group())
+        return f"\0{len(verbatim) - 1}\0"
+
+    css = _CSS_TOKENS.sub(hold, css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    # Only after ":" - a space before it is a descendant combinator (.card :hover)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}").strip()
+    return re.sub(r"\0(\d+)\0", lambda held: verbatim[int(held.group(1))], css)
+
+
+@st.cache_resource
+def _read_css(path, mtime):
+    """Minified file contents (mtime keys the entry so edits are picked up)"""
+    with open(path) as f:
+        return minify_css(f.read())
+
+
+def load_css(path):
+    """Minified stylesheet, served from memory after the first read"""
+    return _read_css(path, os.path.getmtime(path))
+
+
+def inject_css(*paths):
+    """Emit the given stylesheets as one <style> element"""
+    css = "".join(load_css(path) for path in paths)
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+# -----------------------------
+# Profile photos: resized once to the display size instead of sending the
+# full-resolution originals
+# -----------------------------
+THUMBNAIL_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+# Device pixels per CSS pixel, so photos stay sharp on HiDPI screens
+THUMBNAIL_SCALE = 2
+
+
+@st.cache_data
+def _make_thumbnail(path, mtime, width, fmt):
+    """Square, center-cropped thumbnail bytes"""
+    size = width * THUMBNAIL_SCALE
+    with Image.open(path) as img:
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        thumb = ImageOps.fit(img, (size, size), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    thumb.save(buffer, format=fmt, quality=85)
+    return buffer.getvalue()
+
+
+def thumbnail(path, width=150, fmt=THUMBNAIL_FORMAT):
+    """Cached thumbnail of an image file for display at width pixels"""
+    return _make_thumbnail(path, os.path.getmtime(path), width, fmt)
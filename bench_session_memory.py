@@ -0,0 +1,65 @@
+import gc
+import pickle
+import sys
+import tracemalloc
+
+from data_loader import start_loading, load_data
+from panel import derive_columns, _derived_view
+from workforce import workforce_columns
+from attrition_retention import attrition_columns
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Memory held by N concurrent sessions mid-rerun: per-rerun deserialized
+# copies (what st.cache_data handed out) vs the shared read-only dataset.
+# Usage: python bench_session_memory.py [n_sessions]
+
+N_SESSIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+
+def allocated():
+    """Bytes currently allocated by Python/numpy plus Arrow-backed string columns"""
+    gc.collect()
+    arrow = pyarrow.total_allocated_bytes() if pyarrow is not None else 0
+    return tracemalloc.get_traced_memory()[0] + arrow
+
+
+def copied_session(frames, session_id):
+    # st.cache_data pickled the cached value and unpickled it for every caller;
+    # tabs then normalized their own copy
+    df, df_raw, df_attrition = pickle.loads(pickle.dumps(frames))
+    return (df, df_raw, df_attrition,
+            derive_columns("workforce", df_raw, workforce_columns, session_id),
+            derive_columns("attrition", df_raw, attrition_columns, session_id))
+
+
+def shared_session(frames, version):
+    df, df_raw, df_attrition = frames
+    return (df, df_raw, df_attrition,
+            derive_columns("workforce", df_raw, workforce_columns, version),
+            derive_columns("attrition", df_raw, attrition_columns, version))
+
+
+def measure(make_session):
+    _derived_view.clear()
+    baseline = allocated()
+    sessions = [make_session(i) for i in range(N_SESSIONS)]
+    total = allocated() - baseline
+    del sessions
+    return total
+
+
+tracemalloc.start()
+frames = load_data(start_loading("bench"))
+
+results = {
+    "per-rerun copies": measure(lambda i: copied_session(frames, ("copy", i))),
+    "shared read-only": measure(lambda i: shared_session(frames, "bench")),
+}
+
+print(f"{N_SESSIONS} simulated sessions")
+for mode, total in results.items():
+    print(f"{mode:>17}: {total / 2**20:8.1f} MiB total, {total / N_SESSIONS / 2**10:8.1f} KiB per session")
@@ -0,0 +1,207 @@
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import data_loader
+import prefetch
+from bounded_cache import cache
+from cache_utils import normalize_raw_data
+from driver_analysis import fit_driver_model, score_risk
+from feature_store import get_feature_matrix
+from survey import train_resignation_model
+
+# Headless benchmark and regression gate. Drives web_app.py with AppTest
+# for each tab, year and widget state, recording cold latency (fastest of
+# COLD_REPEATS runs with all caches and loaded workbooks dropped; scheduling
+# noise only ever adds time), warm latency (median of fresh sessions
+# against warm caches) and peak traced memory of a warm rerun (smallest of
+# PEAK_REPEATS). Also times the key operations on their own: workbook load,
+# normalization, driver and risk model training, and batch risk scoring.
+# Everything is compared with the baseline committed next to this script;
+# the run fails when anything is slower/larger than the baseline by more
+# than the tolerance.
+# Usage: python bench_tabs.py [--save-baseline] [--quick] [--tolerance 0.5]
+# The tolerance can also come from BENCH_TOLERANCE. With HR_RAW_DATA set
+# (e.g. a generate_hr_panel.py panel) results are kept in a separate
+# baseline per dataset.
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web_app.py")
+BASELINE = "bench_tabs_baseline.json"
+if "HR_RAW_DATA" in os.environ:
+    BASELINE = f"bench_tabs_baseline.{os.path.splitext(os.path.basename(data_loader.RAW_DATA_FILE))[0]}.json"
+YEARS = ["All"] + list(range(2020, 2026))
+COLD_REPEATS = 2
+WARM_REPEATS = 5
+PEAK_REPEATS = 3
+
+# A result is flagged when it is this much slower / larger than the
+# baseline, ignoring differences below the noise floor of its metric
+TOLERANCE = 0.5
+NOISE_FLOORS = {"cold_s": 0.25, "warm_s": 0.25, "peak_mib": 1.0, "time_s": 0.05}
+
+# Rows scored in one batch by the risk model, and the time that must take
+# regardless of the baseline
+SCORED_ROWS = 100_000
+SCORING_BUDGET_S = 1.0
+
+# Non-default widget states per tab (the default state runs for every tab)
+WIDGET_STATES = {
+    1: [
+        {"retention_view_dropdown": "Generation"},
+        {"resigned_month_dropdown": ["January", "June"], "attrition_month_dropdown": ["March"]},
+    ],
+    3: [
+        {"risk_segment_dropdown": "Generation"},
+    ],
+}
+
+save_baseline = "--save-baseline" in sys.argv
+years = ["All", 2025] if "--quick" in sys.argv else YEARS
+tolerance = float(os.environ.get("BENCH_TOLERANCE", TOLERANCE))
+if "--tolerance" in sys.argv:
+    tolerance = float(sys.argv[sys.argv.index("--tolerance") + 1])
+
+
+def scenarios():
+    for tab in range(5):
+        for year in years:
+            for state in [{}] + WIDGET_STATES.get(tab, []):
+                name = f"tab{tab} {year}" + "".join(f" {key}={value}" for key, value in state.items())
+                yield name, tab, year, state
+
+
+def drop_caches():
+    """Forget everything a cold server would not have"""
+    prefetch.reset()
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    cache.clear()
+    data_loader.reset()
+
+
+def run(tab, year, state):
+    """Render one scenario in a fresh session; returns (seconds, exceptions)"""
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.query_params["active_tab"] = str(tab)
+    at.session_state["selected_year"] = year
+    for key, value in state.items():
+        at.session_state[key] = value
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    return elapsed, [exc.value.splitlines()[0] for exc in at.exception]
+
+
+def peak_memory(tab, year, state):
+    """Smallest peak Python/numpy allocation of PEAK_REPEATS warm reruns, in MiB"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(PEAK_REPEATS):
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            run(tab, year, state)
+            peaks.append((tracemalloc.get_traced_memory()[1] - start) / 2**20)
+        return min(peaks)
+    finally:
+        tracemalloc.stop()
+
+
+def operation_time(operation, setup=None):
+    """Fastest wall time of operation() over WARM_REPEATS calls"""
+    times = []
+    for _ in range(WARM_REPEATS):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        operation()
+        times.append(time.perf_counter() - start)
+    return {"time_s": round(min(times), 4)}
+
+
+def load_workbooks():
+    data_loader.reset()
+    return data_loader.load_data(data_loader.start_loading(("bench_tabs", time.perf_counter())))
+
+
+results = {}
+errors = []
+for name, tab, year, state in scenarios():
+    cold = []
+    for _ in range(COLD_REPEATS):
+        drop_caches()
+        elapsed, exceptions = run(tab, year, state)
+        cold.append(elapsed)
+        errors += [f"{name}: {exc}" for exc in exceptions]
+    cold = min(cold)
+
+    warm = []
+    for _ in range(WARM_REPEATS):
+        prefetch.wait_idle()
+        warm.append(run(tab, year, state)[0])
+    prefetch.wait_idle()
+
+    results[name] = {
+        "cold_s": round(cold, 3),
+        "warm_s": round(statistics.median(warm), 3),
+        "peak_mib": round(peak_memory(tab, year, state), 1),
+    }
+    print(f"{name:<70} cold {cold:6.2f}s  warm {results[name]['warm_s']:6.2f}s  peak {results[name]['peak_mib']:7.1f} MiB")
+
+# Key operations on their own (outside any session)
+drop_caches()
+results["op load_data"] = operation_time(load_workbooks)
+df, df_raw, df_attrition = load_workbooks()
+results["op normalize_raw_data"] = operation_time(lambda: normalize_raw_data(df_raw), setup=lambda: cache.clear("raw"))
+for target in ("resignation", "promotion"):
+    X, y = get_feature_matrix(df_raw, "All", target)
+    results[f"op driver_training:{target}"] = operation_time(lambda: fit_driver_model(X, y))
+results["op train_resignation_model"] = operation_time(
+    lambda: train_resignation_model(df_raw), setup=lambda: cache.clear("models")
+)
+X, y = get_feature_matrix(df_raw, "All", "resignation")
+rf, X_scored = fit_driver_model(X, y), np.resize(X, (SCORED_ROWS, X.shape[1]))
+results[f"op score_risk:{SCORED_ROWS}_rows"] = operation_time(lambda: score_risk(rf, X_scored))
+for name, result in results.items():
+    if name.startswith("op "):
+        print(f"{name:<70} {result['time_s']:6.3f}s")
+
+if errors:
+    print("\n".join(errors))
+    sys.exit(f"{len(errors)} scenario(s) raised")
+
+scoring = results[f"op score_risk:{SCORED_ROWS}_rows"]["time_s"]
+if scoring > SCORING_BUDGET_S:
+    sys.exit(f"Scoring {SCORED_ROWS} rows took {scoring:.2f}s, over the {SCORING_BUDGET_S:.0f}s budget")
+
+if save_baseline:
+    with open(BASELINE, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved {len(results)} scenarios and operations to {BASELINE}")
+    sys.exit()
+
+if not os.path.exists(BASELINE):
+    sys.exit(f"No baseline at {BASELINE}; run with --save-baseline first")
+with open(BASELINE) as f:
+    baseline = json.load(f)
+
+regressions = []
+for name, current in results.items():
+    before = baseline.get(name)
+    if before is None:
+        continue
+    for metric, value in current.items():
+        if metric in before and value > before[metric] * (1 + tolerance) and value - before[metric] > NOISE_FLOORS[metric]:
+            regressions.append(f"{name}: {metric} {before[metric]} -> {value}")
+
+if regressions:
+    print("\n".join(regressions))
+    sys.exit(f"{len(regressions)} regression(s) beyond {tolerance:.0%} of {BASELINE}")
+print(f"{len(results)} scenarios and operations within {tolerance:.0%} of {BASELINE}")
@@ -0,0 +1,171 @@
+import functools
+import inspect
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from cache_stats import approx_bytes, set_namespace_usage
+
+# -----------------------------
+# Bounded in-process cache for derived data: one memory budget split into
+# per-namespace quotas, each evicting its least recently used entries by
+# size. Values are shared by every session (like st.cache_resource), so
+# cached functions must return read-only results.
+# -----------------------------
+CACHE_BUDGET_MB = float(os.environ.get("DASHBOARD_CACHE_MB", 512))
+
+# Share of the budget for each namespace
+NAMESPACE_QUOTAS = {
+    "raw": 0.40,         # normalized panels and derived-column views
+    "aggregates": 0.30,  # year slices, feature matrices, risk scores
+    "figures": 0.10,     # serialized Plotly figures
+    "models": 0.20,      # fitted models
+}
+
+
+class BoundedCache:
+    """Size-aware LRU store with a byte quota per namespace"""
+
+    def __init__(self, budget_mb, quotas):
+        self._lock = threading.Lock()
+        self._entries = {namespace: OrderedDict() for namespace in quotas}  # key -> (value, bytes)
+        self._bytes = dict.fromkeys(quotas, 0)
+        self._evictions = dict.fromkeys(quotas, 0)
+        self._rejected = dict.fromkeys(quotas, 0)
+        # One lock per key being computed, so concurrent sessions (and the
+        # prefetch threads) compute each value once
+        self._computing = {}
+        self.configure(budget_mb, quotas)
+
+    def configure(self, budget_mb, quotas=None):
+        """Change the budget (and optionally the quota shares); evicts down to the new limits"""
+        with self._lock:
+            self.budget_mb = budget_mb
+            self.shares = dict(quotas or self.shares)
+            self.quotas = {ns: int(budget_mb * 2**20 * share) for ns, share in self.shares.items()}
+            for namespace in self.quotas:
+                self._evict(namespace)
+
+    def _evict(self, namespace):
+        entries = self._entries[namespace]
+        while entries and self._bytes[namespace] > self.quotas[namespace]:
+            _, (_, size) = entries.popitem(last=False)
+            self._bytes[namespace] -= size
+            self._evictions[namespace] += 1
+
+    def get(self, namespace, key):
+        """(True, value) and mark as recently used, or (False, None)"""
+        with self._lock:
+            entry = self._entries[namespace].get(key)
+            if entry is None:
+                return False, None
+            self._entries[namespace].move_to_end(key)
+            return True, entry[0]
+
+    def put(self, namespace, key, value, size=None):
+        """Store a value; values larger than the whole quota are not kept"""
+        if size is None:
+            size = approx_bytes(value)
+        with self._lock:
+            if size > self.quotas[namespace]:
+                self._rejected[namespace] += 1
+                return False
+            entries = self._entries[namespace]
+            if key in entries:
+                self._bytes[namespace] -= entries.pop(key)[1]
+            entries[key] = (value, size)
+            self._bytes[namespace] += size
+            self._evict(namespace)
+            return True
+
+    def get_or_compute(self, namespace, key, compute):
+        """Cached value for key, computing and storing it on a miss"""
+        found, value = self.get(namespace, key)
+        if found:
+            return value
+        with self._lock:
+            key_lock = self._computing.setdefault((namespace, key), threading.Lock())
+        with key_lock:
+            try:
+                found, value = self.get(namespace, key)
+                if not found:
+                    value = compute()
+                    self.put(namespace, key, value)
+                return value
+            finally:
+                with self._lock:
+                    self._computing.pop((namespace, key), None)
+
+    def clear(self, namespace=None, name=None):
+        """Drop every entry, a namespace, or one function's entries in a namespace"""
+        with self._lock:
+            for ns in [namespace] if namespace else list(self._entries):
+                entries = self._entries[ns]
+                for key in [key for key in entries if name is None or key[0] == name]:
+                    self._bytes[ns] -= entries.pop(key)[1]
+
+    def sizes(self, namespace, name):
+        """(entries, bytes) held for one function"""
+        with self._lock:
+            held = [size for key, (_, size) in self._entries[namespace].items() if key[0] == name]
+        return len(held), sum(held)
+
+    def usage(self):
+        """Per-namespace entries, bytes, quota, evictions and values too large to keep"""
+        with self._lock:
+            return [
+                {
+                    "namespace": ns,
+                    "entries": len(self._entries[ns]),
+                    "bytes": self._bytes[ns],
+                    "quota_bytes": self.quotas[ns],
+                    "evictions": self._evictions[ns],
+                    "rejected": self._rejected[ns],
+                }
+                for ns in self._entries
+            ]
+
+
+cache = BoundedCache(CACHE_BUDGET_MB, NAMESPACE_QUOTAS)
+set_namespace_usage(cache.usage)
+
+
+def _hash_arg(value, hash_funcs):
+    for kind, hash_func in (hash_funcs or {}).items():
+        if isinstance(value, kind):
+            return hash_func(value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes()
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def bounded_cache(namespace, hash_funcs=None):
+    """Cache a function's results in the budgeted cache under namespace.
+
+    Works like st.cache_resource: arguments are hashed (hash_funcs by type,
+    parameters starting with "_" are skipped) and the same object is returned
+    to every caller.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, tuple(
+                _hash_arg(value, hash_funcs) for param, value in bound.arguments.items() if not param.startswith("_")
+            ))
+            return cache.get_or_compute(namespace, key, lambda: func(*args, **kwargs))
+
+        wrapper.clear = lambda: cache.clear(namespace, name)
+        wrapper.cache_sizes = lambda: cache.sizes(namespace, name)
+        return wrapper
+    return decorator
@@ -0,0 +1,31 @@
+import pandas as pd
+from cache_utils import array_fingerprint
+from feature_store import get_feature_matrix
+from driver_analysis import TARGET_FEATURES, PRECOMPUTED_DRIVERS_FILE, PRECOMPUTED_SHEETS, fit_importances
+
+# Precompute driver importances for the Survey tab's precomputed drivers mode.
+# Re-run whenever the HR data changes; stale rows are ignored by the app.
+
+df_raw = pd.read_excel("HR Cleaned Data 01.09.26.xlsx", sheet_name="Data")
+df_raw["Year"] = pd.to_datetime(df_raw["Calendar Year"]).dt.year
+
+year_options = ["All"] + sorted(df_raw["Year"].dropna().astype(int).unique().tolist())
+
+with pd.ExcelWriter(PRECOMPUTED_DRIVERS_FILE) as writer:
+    for target, features in TARGET_FEATURES.items():
+        rows = []
+        for year in year_options:
+            X, y = get_feature_matrix(df_raw, year, target)
+            if len(y) == 0:
+                continue
+            importance_df = fit_importances(X, y, features)
+            # Store in feature order so the app can realign bootstrap bounds
+            importance_df = importance_df.sort_index()
+            importance_df["Year"] = str(year)
+            importance_df["Fingerprint"] = array_fingerprint(X, y)
+            rows.append(importance_df[["Driver", "Importance", "Year", "Fingerprint"]])
+            print(f"{target} {year}: top driver {importance_df.loc[importance_df['Importance'].idxmax(), 'Driver']}")
+
+        pd.concat(rows, ignore_index=True).to_excel(writer, sheet_name=PRECOMPUTED_SHEETS[target], index=False)
+
+print(f"Output saved to {PRECOMPUTED_DRIVERS_FILE}")
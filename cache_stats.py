@@ -0,0 +1,160 @@
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Cache accounting: hits, misses, compute time saved and approximate bytes
+# held by every cached section, across all sessions of this process. Fed by
+# timing.section(cached=True); shown in the ?debug=1 panel and written to a
+# local metrics file.
+# -----------------------------
+CACHE_METRICS_FILE = "cache_metrics.json"
+WRITE_INTERVAL_S = 5
+
+_stats = {}
+_max_entries = {}
+_size_providers = {}
+_namespace_usage = None
+_lock = threading.Lock()
+_last_write = 0.0
+
+
+def approx_bytes(value):
+    """Approximate in-memory size of a cached value (buffers shared between
+    values, e.g. a derived view and its source panel, are counted in each)"""
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(approx_bytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(approx_bytes(item) for item in value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+def call_key(args, kwargs):
+    """Identity of a cached call's arguments; shared panels are long-lived
+    objects, so their id stands in for the content hash Streamlit uses"""
+    def part(value):
+        return ("frame", id(value)) if isinstance(value, (pd.DataFrame, pd.Series)) else repr(value)
+    return tuple(part(a) for a in args) + tuple((k, part(v)) for k, v in sorted(kwargs.items()))
+
+
+def register_cache(name, max_entries=None, sizes=None):
+    """Declare a cache's entry limit so evicted entries stop counting, or a
+    sizes() -> (entries, bytes) callable for caches that track their own"""
+    with _lock:
+        _max_entries[name] = max_entries
+        if sizes is not None:
+            _size_providers[name] = sizes
+
+
+def set_namespace_usage(usage):
+    """Register the budgeted cache's per-namespace usage() for the metrics file"""
+    global _namespace_usage
+    _namespace_usage = usage
+
+
+def namespace_usage():
+    return _namespace_usage() if _namespace_usage is not None else []
+
+
+def record_call(name, hit, ms, key=None, value=None):
+    """Account one call of a cached section"""
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = {"hits": 0, "misses": 0, "hit_ms": 0.0, "miss_ms": 0.0, "entries": OrderedDict()}
+        if hit:
+            stats["hits"] += 1
+            stats["hit_ms"] += ms
+        else:
+            stats["misses"] += 1
+            stats["miss_ms"] += ms
+
+        # Caches that report their own sizes need no key tracking
+        if name in _size_providers:
+            key = None
+        if key is not None:
+            entries = stats["entries"]
+            if key in entries:
+                entries.move_to_end(key)
+            if not hit or key not in entries:
+                entries[key] = None
+            limit = _max_entries.get(name)
+            while limit and len(entries) > limit:
+                entries.popitem(last=False)
+        # Sized outside the lock below (deep sizes of large frames take a while)
+        needs_size = key is not None and value is not None and stats["entries"].get(key) is None
+
+    if needs_size:
+        size = approx_bytes(value)
+        with _lock:
+            if key in stats["entries"]:
+                stats["entries"][key] = size
+    write_metrics()
+
+
+def snapshot():
+    """Per-section totals: hit rate, time saved and approximate bytes held"""
+    with _lock:
+        providers = dict(_size_providers)
+    own_sizes = {name: sizes() for name, sizes in providers.items()}
+    with _lock:
+        rows = []
+        for name, stats in _stats.items():
+            calls = stats["hits"] + stats["misses"]
+            avg_miss = stats["miss_ms"] / stats["misses"] if stats["misses"] else None
+            avg_hit = stats["hit_ms"] / stats["hits"] if stats["hits"] else None
+            saved = stats["hits"] * max(avg_miss - avg_hit, 0) if avg_miss is not None and avg_hit is not None else 0.0
+            sizes = [size for size in stats["entries"].values() if size is not None]
+            entries = len(stats["entries"])
+            if name in own_sizes:
+                entries, held = own_sizes[name]
+                sizes = [held] if entries else []
+            rows.append({
+                "cache": name,
+                "hits": stats["hits"],
+                "misses": stats["misses"],
+                "hit_rate": round(stats["hits"] / calls, 3) if calls else None,
+                "avg_miss_ms": round(avg_miss, 2) if avg_miss is not None else None,
+                "avg_hit_ms": round(avg_hit, 2) if avg_hit is not None else None,
+                "saved_ms": round(saved, 1),
+                "entries": entries or None,
+                "bytes": sum(sizes) if sizes else None,
+            })
+    return rows
+
+
+def write_metrics(force=False):
+    """Rewrite the metrics file (at most every WRITE_INTERVAL_S unless forced)"""
+    global _last_write
+    now = time.time()
+    with _lock:
+        if not force and now - _last_write < WRITE_INTERVAL_S:
+            return
+        _last_write = now
+    tmp = f"{CACHE_METRICS_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump({
+                "updated": round(now, 3), "pid": os.getpid(),
+                "caches": snapshot(), "namespaces": namespace_usage(),
+            }, f, indent=2)
+        os.replace(tmp, CACHE_METRICS_FILE)
+    except OSError:
+        pass
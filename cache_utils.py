@@ -1,10 +1,19 @@
 import streamlit as st
+import hashlib
+import os
 import pandas as pd
+from panel import freeze, PANEL_HASH_FUNCS
+from timing import timed, mark_cache_miss
+from bounded_cache import bounded_cache
 
 
-@st.cache_data
+# Normalized panels are shared read-only across sessions (the budgeted cache
+# returns the same object instead of a per-call copy)
+@timed("normalize_raw_data", cached=True)
+@bounded_cache("raw", hash_funcs=PANEL_HASH_FUNCS)
 def normalize_raw_data(df_raw):
     """Normalize common columns across all tabs"""
+    mark_cache_miss()
     def to_num(x): 
         s = str(x).strip().upper() 
         if s in {"1", "YES", "TRUE"}: 
@@ -22,16 +31,41 @@ def normalize_raw_data(df_raw):
     df["Year"] = df["Calendar Year"].dt.year
     df["Resignee Checking"] = df["Resignee Checking"].astype(str).str.strip().str.upper()
     
-    return df
+    return freeze(df)
 
 
-@st.cache_data
+@timed("get_active_employees", cached=True)
+@bounded_cache("raw", hash_funcs=PANEL_HASH_FUNCS)
 def get_active_employees(df_normalized):
     """Filter for active employees only"""
-    return df_normalized[df_normalized["Resignee Checking"] == "ACTIVE"]
+    mark_cache_miss()
+    return freeze(df_normalized[df_normalized["Resignee Checking"] == "ACTIVE"])
 
 
-@st.cache_data
+@timed("get_year_data", cached=True)
+@bounded_cache("aggregates", hash_funcs=PANEL_HASH_FUNCS)
 def get_year_data(df_normalized, year):
     """Get data for a specific year"""
-    return df_normalized[df_normalized["Year"] == int(year)]
+    mark_cache_miss()
+    return freeze(df_normalized[df_normalized["Year"] == int(year)])
+
+
+def data_fingerprint(df):
+    """Stable content hash used to key results derived from a DataFrame"""
+    hashed = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return format(int(hashed.sum(dtype="uint64")), "016x")
+
+
+def array_fingerprint(*arrays):
+    """Content hash of numpy arrays (e.g. an encoded feature matrix and its target)"""
+    digest = hashlib.sha1()
+    for arr in arrays:
+        digest.update(str(arr.dtype).encode())
+        digest.update(arr.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def source_version(*paths):
+    """Version tag for source files; changes whenever any of them is modified"""
+    parts = [f"{p}:{os.path.getmtime(p)}:{os.path.getsize(p)}" for p in paths if os.path.exists(p)]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
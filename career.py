@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+from figure_cache import cached_figure
+from chart_utils import nice_bin_edges, histogram_counts, histogram_bar, scale_traces
+from metric_cards import metric_row
 from cache_utils import normalize_raw_data, get_active_employees, get_year_data
 
 
@@ -59,22 +63,11 @@ def render(df, df_raw, selected_year):
         promotion_rate = 0
 
     # Top metrics row
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Promotions & Transfers</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{total_promotions_transfers}</div>", unsafe_allow_html=True)
-    
-    with col2:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Average Tenure</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{avg_tenure:.1f} yrs</div>", unsafe_allow_html=True)
-    
-    with col3:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Promotion Rate</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{promotion_rate:.1f}%</div>", unsafe_allow_html=True)
+    metric_row([
+        ("Promotions & Transfers", total_promotions_transfers),
+        ("Average Tenure", f"{avg_tenure:.1f} yrs"),
+        ("Promotion Rate", f"{promotion_rate:.1f}%"),
+    ])
 
     st.markdown("<style>h2 { margin-bottom: -0.5rem !important; } </style>", unsafe_allow_html=True)
 
@@ -92,53 +85,61 @@ def render(df, df_raw, selected_year):
         with col1:
             # Line chart for yearly trend
             st.markdown("##### Promotions & Transfers per Year")
-            # Only show all years if "All" is selected, otherwise show only the selected year
-            if selected_year == "All":
-                plot_data = promo_summary.copy()
-                plot_data["Year_str"] = plot_data["Year"].astype(str)   # convert to string for categorical axis
-                x_col = "Year_str"
-            else:
-                plot_data = promo_summary[promo_summary["Year"] == selected_year].copy()
-                plot_data["Year_str"] = str(selected_year)              # single year as string
-                x_col = "Year_str"
-
-            fig1 = px.line(
-                plot_data,
-                x=x_col,
-                y="Promotion & Transfer",
-                markers=True
-            )
-            fig1.update_traces(
-                line=dict(width=3, color="#00008B"),
-                marker=dict(size=8, color="#00008B")
-            )
-            fig1.update_layout(
-                height=250,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                xaxis_title="Year",  # Remove x-axis label
-                yaxis_title="Count"
-            )
-            fig1.update_xaxes(type="category")
+            def build_trend_chart():
+                # Only show all years if "All" is selected, otherwise show only the selected year
+                if selected_year == "All":
+                    plot_data = promo_summary.copy()
+                    plot_data["Year_str"] = plot_data["Year"].astype(str)   # convert to string for categorical axis
+                    x_col = "Year_str"
+                else:
+                    plot_data = promo_summary[promo_summary["Year"] == selected_year].copy()
+                    plot_data["Year_str"] = str(selected_year)              # single year as string
+                    x_col = "Year_str"
+
+                fig1 = px.line(
+                    plot_data,
+                    x=x_col,
+                    y="Promotion & Transfer",
+                    markers=True
+                )
+                fig1.update_traces(
+                    line=dict(width=3, color="#00008B"),
+                    marker=dict(size=8, color="#00008B")
+                )
+                fig1.update_layout(
+                    height=250,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    xaxis_title="Year",  # Remove x-axis label
+                    yaxis_title="Count"
+                )
+                fig1.update_xaxes(type="category")
+                return scale_traces(fig1)
+
+            fig1 = cached_figure("promotions_per_year", (selected_year,), build_trend_chart)
             st.plotly_chart(fig1, use_container_width=True)
 
         with col2:
             # Stacked bar chart for position/level distribution
             st.markdown("##### By Position/Level")
-            pos_summary_plot = pos_summary.copy()
-            pos_summary_plot["Year"] = pos_summary_plot["Year"].astype(str)  # Treat Year as category
-            fig2 = px.bar(
-                pos_summary_plot,
-                x="Year",
-                y="Promotion & Transfer",
-                color="Position/Level",
-                color_discrete_map={"Associate": "#6495ED", "Manager & Up": "#00008B"}
-            )
-            fig2.update_layout(
-                height=250,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                yaxis={"title": "Count"},
-                xaxis={"title": "Year"}  # Remove x-axis label
-            )
+            def build_position_chart():
+                pos_summary_plot = pos_summary.copy()
+                pos_summary_plot["Year"] = pos_summary_plot["Year"].astype(str)  # Treat Year as category
+                fig2 = px.bar(
+                    pos_summary_plot,
+                    x="Year",
+                    y="Promotion & Transfer",
+                    color="Position/Level",
+                    color_discrete_map={"Associate": "#6495ED", "Manager & Up": "#00008B"}
+                )
+                fig2.update_layout(
+                    height=250,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    yaxis={"title": "Count"},
+                    xaxis={"title": "Year"}  # Remove x-axis label
+                )
+                return fig2
+
+            fig2 = cached_figure("promotions_by_position", (selected_year,), build_position_chart)
             st.plotly_chart(fig2, use_container_width=True)
 
     # Tenure Distribution of Promoted Employees
@@ -147,24 +148,35 @@ def render(df, df_raw, selected_year):
         promoted_employees = career_year[career_year["Promotion & Transfer"] == 1]
 
         if not promoted_employees.empty:
-            fig3 = px.histogram(
-                promoted_employees,
-                x="Tenure",
-                nbins=10,
-                histnorm=None,
-                color_discrete_sequence=["#00008B"]
-            )
-            fig3.update_traces(
-                texttemplate="%{y}",
-                textposition="outside"
-            )
-            fig3.update_layout(
-                height=250,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                yaxis={"title": "Count"},
-                xaxis={"title": "Tenure (years)"},
-                showlegend=False
-            )
+            def build_tenure_chart():
+                # Bin tenure server-side so only one bar per bin is sent to the browser
+                tenure = pd.to_numeric(promoted_employees["Tenure"], errors="coerce").to_numpy(dtype=float)
+                edges = nice_bin_edges(tenure, nbins=10)
+                fig3 = go.Figure(histogram_bar(
+                    edges,
+                    histogram_counts(tenure, edges),
+                    marker_color="#00008B",
+                    texttemplate="%{y}",
+                    textposition="outside"
+                ))
+                fig3.update_layout(
+                    height=250,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    yaxis={"title": "Count"},
+                    xaxis={"title": "Tenure (years)"},
+                    bargap=0,
+                    showlegend=False
+                )
+                return fig3
+
+            fig3 = cached_figure("promoted_tenure_distribution", (selected_year,), build_tenure_chart)
             st.plotly_chart(fig3, use_container_width=True)
         else:
             st.info("No promoted employees found for the selected year.")
+
+
+def prefetch(df, df_raw, selected_year, data_version=None, df_attrition=None):
+    """Warm the caches render() reads (run off the request path by prefetch.py)"""
+    df_active = get_active_employees(normalize_raw_data(df_raw))
+    if selected_year != "All":
+        get_year_data(df_active, selected_year)
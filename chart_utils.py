@@ -0,0 +1,188 @@
+import math
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+# -----------------------------
+# Server-side histogram binning: the browser receives one bar per bin
+# instead of every underlying row
+# -----------------------------
+def nice_bin_edges(values, nbins=10):
+    """Bin edges with a round width (1, 2 or 5 x 10^k) covering values.
+
+    Integer data with an integer width gets edges on half-units, so no value
+    falls on an edge; with width 1 each bar is centered on its whole number,
+    wider bins each cover `width` whole numbers.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return np.array([0.0, 1.0])
+
+    lo, hi = values.min(), values.max()
+    raw_width = (hi - lo) / nbins if hi > lo else 1.0
+    magnitude = 10 ** math.floor(math.log10(raw_width))
+    width = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_width)
+
+    offset = 0.5 if width >= 1 and float(width).is_integer() and np.all(values == np.round(values)) else 0.0
+    start = math.floor((lo + offset) / width) * width - offset
+    n = max(1, math.ceil((hi - start) / width + 1e-9))
+    if start + n * width <= hi:
+        n += 1
+    return start + width * np.arange(n + 1)
+
+
+def histogram_counts(values, edges, weights=None):
+    """Counts (or summed weights) per bin for the given edges"""
+    values = np.asarray(values, dtype=float)
+    mask = ~np.isnan(values)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)[mask]
+    counts, _ = np.histogram(values[mask], bins=edges, weights=weights)
+    return counts
+
+
+def histogram_bar(edges, counts, **bar_kwargs):
+    """Bar trace drawing pre-binned counts as histogram columns.
+
+    Empty bins are left out (they draw nothing) and arrays use compact
+    dtypes to keep the serialized payload small.
+    """
+    edges = np.asarray(edges, dtype=float)
+    counts = np.asarray(counts)
+    keep = counts > 0
+    if np.all(counts == np.round(counts)):
+        counts = counts.astype(np.int32)
+
+    bar_kwargs.setdefault("width", np.diff(edges)[keep].astype(np.float32))
+    return go.Bar(
+        x=((edges[:-1] + edges[1:]) / 2)[keep].astype(np.float32),
+        y=counts[keep],
+        **bar_kwargs
+    )
+
+
+# -----------------------------
+# Large scatter/line series: WebGL above a point threshold and downsampling
+# of long lines so the browser never draws more than it can show
+# -----------------------------
+WEBGL_THRESHOLD = 1000
+MAX_LINE_POINTS = 2000
+
+# Per-point trace arrays that have to be subset along with x/y
+_POINT_ARRAYS = ("text", "hovertext", "customdata", "ids")
+_MARKER_ARRAYS = ("size", "color", "symbol", "opacity")
+
+
+def _numeric_axis(values):
+    """Values as floats for distance math; positions for categorical/date axes"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(float)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return np.arange(len(values), dtype=float)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, per bucket, the point forming the
+    largest triangle with the previous pick and the next bucket's average.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _numeric_axis(x)
+    y = np.asarray(y, dtype=float)
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    picked = np.empty(n_out, dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = bounds[i], bounds[i + 1]
+        next_end = bounds[i + 2] if i + 2 < len(bounds) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.nanargmax(area)) if np.any(~np.isnan(area)) else start
+        picked[i + 1] = prev
+    return picked
+
+
+def minmax_indices(y, n_out):
+    """Indices of each bucket's min and max (keeps spikes; cheaper than LTTB)"""
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    bounds = np.linspace(0, n, n_buckets + 1).astype(int)
+    picked = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        chunk = y[start:end]
+        if chunk.size:
+            picked.extend((start + int(np.nanargmin(chunk)), start + int(np.nanargmax(chunk))))
+    return np.unique(picked)
+
+
+def _subset_trace(spec, idx):
+    """Keep only the points at idx in a trace spec, including per-point arrays"""
+    n = len(spec["y"])
+
+    def take(values):
+        if values is None or np.isscalar(values) or len(values) != n:
+            return values
+        return np.asarray(values)[idx]
+
+    for key in ("x", "y") + _POINT_ARRAYS:
+        if key in spec:
+            spec[key] = take(spec[key])
+    marker = spec.get("marker")
+    if isinstance(marker, dict):
+        for key in _MARKER_ARRAYS:
+            if key in marker:
+                marker[key] = take(marker[key])
+
+
+def scale_traces(fig, webgl_threshold=WEBGL_THRESHOLD, max_line_points=MAX_LINE_POINTS, method="lttb"):
+    """Switch big scatter traces to WebGL and downsample long lines in place.
+
+    Marker-only traces keep every point (each is an employee or a group);
+    line traces above max_line_points are reduced with LTTB or min-max.
+    Small figures pass through untouched.
+    """
+    traces = []
+    changed = False
+    for trace in fig.data:
+        spec = trace.to_plotly_json()
+        if spec.get("type") not in ("scatter", "scattergl") or spec.get("y") is None:
+            traces.append(spec)
+            continue
+
+        mode = spec.get("mode") or "lines"
+        if "lines" in mode and len(spec["y"]) > max_line_points:
+            if method == "minmax":
+                idx = minmax_indices(spec["y"], max_line_points)
+            else:
+                idx = lttb_indices(spec.get("x", np.arange(len(spec["y"]))), spec["y"], max_line_points)
+            _subset_trace(spec, idx)
+            changed = True
+
+        if spec["type"] == "scatter" and len(spec["y"]) > webgl_threshold:
+            spec["type"] = "scattergl"
+            changed = True
+        traces.append(spec)
+
+    if changed:
+        fig.data = []
+        fig.add_traces(traces)
+    return fig
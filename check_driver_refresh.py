@@ -0,0 +1,45 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from feature_store import get_feature_matrix
+from driver_analysis import RESIGNATION_FEATURES, fit_driver_model, grow_driver_model
+
+# Compare an incremental driver refresh against a full refit.
+# The latest month of records is treated as newly appended data.
+
+TOLERANCE = 0.05  # max absolute difference in importance share
+
+df_raw = pd.read_excel("HR Cleaned Data 01.09.26.xlsx", sheet_name="Data")
+df_raw["Year"] = pd.to_datetime(df_raw["Calendar Year"]).dt.year
+
+X, y = get_feature_matrix(df_raw, "All", "resignation")
+features = RESIGNATION_FEATURES
+
+# Hold back the final twelfth of rows as the "new month"
+n_old = len(y) - len(y) // 12
+
+rf = fit_driver_model(X[:n_old], y[:n_old])
+
+start = time.perf_counter()
+rf = grow_driver_model(rf, X[n_old:], y[n_old:], len(y))
+incremental_time = time.perf_counter() - start
+if rf is None:
+    sys.exit("Incremental refresh declined; new rows need a full refit")
+
+start = time.perf_counter()
+rf_full = fit_driver_model(X, y)
+full_time = time.perf_counter() - start
+
+diff = np.abs(rf.feature_importances_ - rf_full.feature_importances_)
+print(pd.DataFrame({
+    "Driver": features,
+    "Incremental": rf.feature_importances_.round(3),
+    "Full Refit": rf_full.feature_importances_.round(3),
+    "Abs Diff": diff.round(3)
+}).to_string(index=False))
+print(f"Incremental: {incremental_time:.3f}s ({rf.n_estimators} trees), full refit: {full_time:.3f}s")
+
+if diff.max() > TOLERANCE:
+    sys.exit(f"Max importance difference {diff.max():.3f} exceeds {TOLERANCE}")
+print("Incremental refresh matches full refit")
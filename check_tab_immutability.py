@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+import data_loader
+from panel import ReadOnlyPanelError, freeze
+
+# Render every tab for every year and fail if any of them writes into the
+# shared panels. Writes raise panel.ReadOnlyPanelError inside the app; the
+# content hashes catch anything that slips past the read-only wrapper.
+# In-place pandas methods are checked directly first: they must raise
+# before touching the data.
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web_app.py")
+TABS = range(5)
+YEARS = ["All"] + list(range(2020, 2026))
+
+INPLACE_CALLS = {
+    "fillna": lambda f: f.fillna(0, inplace=True),
+    "replace": lambda f: f.replace(1.0, 9.0, inplace=True),
+    "ffill": lambda f: f.ffill(inplace=True),
+    "bfill": lambda f: f.bfill(inplace=True),
+    "where": lambda f: f.where(f > 1, -1, inplace=True),
+    "mask": lambda f: f.mask(f > 1, -1, inplace=True),
+    "clip": lambda f: f.clip(0, 2, inplace=True),
+    "interpolate": lambda f: f.interpolate(inplace=True),
+    "dropna": lambda f: f.dropna(inplace=True),
+    "sort_values": lambda f: f.sort_values("a", inplace=True),
+    "rename": lambda f: f.rename(columns={"a": "z"}, inplace=True),
+    "eval": lambda f: f.eval("a = b + 1", inplace=True),
+    "update": lambda f: f.update(pd.DataFrame({"a": [7.0, 7.0, 7.0]})),
+}
+
+
+def panel_hashes():
+    jobs = next(iter(data_loader._jobs.values()))
+    df, df_raw, df_attrition = data_loader.load_data(jobs)
+    frames = {f"sheet {name}": sheet for name, sheet in df.items()}
+    frames.update({"df_raw": df_raw, "df_attrition": df_attrition})
+    return {
+        name: (tuple(frame.columns), int(pd.util.hash_pandas_object(frame).sum()))
+        for name, frame in frames.items()
+    }
+
+
+failures = []
+for name, call in INPLACE_CALLS.items():
+    frame = freeze(pd.DataFrame({"a": [1.0, np.nan, 3.0], "b": [1.0, 2.0, 3.0]}))
+    original = frame.copy()
+    try:
+        call(frame)
+        failures.append(f"{name}(inplace=True) did not raise")
+    except ReadOnlyPanelError:
+        pass
+    if not frame.equals(original):
+        failures.append(f"{name}(inplace=True) changed the panel")
+
+before = None
+for year in YEARS:
+    for tab in TABS:
+        at = AppTest.from_file(APP, default_timeout=300)
+        at.query_params["active_tab"] = str(tab)
+        at.session_state["selected_year"] = year
+        at.run()
+
+        for exc in at.exception:
+            failures.append(f"tab {tab}, year {year}: {exc.value.splitlines()[0]}")
+
+        if before is None:
+            before = panel_hashes()
+        changed = [name for name, value in panel_hashes().items() if before.get(name) != value]
+        if changed:
+            failures.append(f"tab {tab}, year {year}: modified {', '.join(changed)}")
+            before = panel_hashes()
+
+if failures:
+    print("\n".join(failures))
+    sys.exit(f"{len(failures)} tab render(s) raised or mutated shared input")
+print(f"All {len(TABS)} tabs x {len(YEARS)} years left the shared panels unchanged")
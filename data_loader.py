@@ -0,0 +1,105 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from panel import freeze
+
+# -----------------------------
+# Workbooks read by the dashboard (their mtimes/sizes form the data version)
+# -----------------------------
+# Employee-year panel (Data and Summary sheets); HR_RAW_DATA points the app at
+# another panel, e.g. a synthetic one from generate_hr_panel.py
+RAW_DATA_FILE = os.environ.get("HR_RAW_DATA", "HR Cleaned Data 01.09.26.xlsx")
+
+DATA_FILES = [
+    "HR_Analysis_Output.xlsx",
+    RAW_DATA_FILE,
+    "Attrition-Vol and Invol.xlsx",
+    "Emp Engagement.xlsx",
+    "Participation.xlsx",
+]
+
+# Workbooks are parsed in background threads so the page shell renders
+# while Excel parsing runs; one load per data version serves every session
+# (the frames are held once per process, not copied per rerun).
+_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="data-load")
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def add_year_column(frame):
+    """Ensure a Year column exists (derived from Calendar Year)"""
+    if "Year" not in frame.columns and "Calendar Year" in frame.columns:
+        frame["Year"] = pd.to_datetime(frame["Calendar Year"]).dt.year
+    return frame
+
+
+def sheet_path(path, sheet_name):
+    """File holding one sheet of a panel: columnar panels keep each sheet in
+    its own file (<name>.parquet for Data, <name>.<sheet>.parquet otherwise)"""
+    if not path.endswith(".parquet") or sheet_name == "Data":
+        return path
+    return f"{path[:-len('.parquet')]}.{sheet_name}.parquet"
+
+
+# A columnar panel's Summary sidecar is part of the data version too
+if sheet_path(RAW_DATA_FILE, "Summary") != RAW_DATA_FILE:
+    DATA_FILES.append(sheet_path(RAW_DATA_FILE, "Summary"))
+
+
+def read_sheet(path, sheet_name):
+    """One sheet of an .xlsx workbook or a .parquet panel"""
+    if path.endswith(".parquet"):
+        return pd.read_parquet(sheet_path(path, sheet_name))
+    return pd.read_excel(path, sheet_name=sheet_name)
+
+
+def _read_analysis_output():
+    return freeze(pd.read_excel("HR_Analysis_Output.xlsx", sheet_name=None))
+
+
+def _read_raw_data():
+    return freeze(add_year_column(read_sheet(RAW_DATA_FILE, "Data")))
+
+
+def _read_attrition():
+    return freeze(add_year_column(pd.read_excel("Attrition-Vol and Invol.xlsx")))
+
+
+def start_loading(version):
+    """Start (or reuse) the background load for a data version.
+
+    Returns the list of futures for (df, df_raw, df_attrition). Loads for
+    older versions are dropped so stale data is not kept in memory.
+    """
+    with _jobs_lock:
+        jobs = _jobs.get(version)
+        if jobs is None or any(job.done() and job.exception() is not None for job in jobs):
+            _jobs.clear()
+            jobs = [_executor.submit(read) for read in (_read_analysis_output, _read_raw_data, _read_attrition)]
+            _jobs[version] = jobs
+        return jobs
+
+
+def reset():
+    """Forget every load, so the next start_loading parses the workbooks again"""
+    with _jobs_lock:
+        _jobs.clear()
+
+
+def is_loaded(jobs):
+    """True once every workbook of a load has been parsed"""
+    return all(job.done() for job in jobs)
+
+
+def load_data(jobs):
+    """Wait for a load and return the shared (df, df_raw, df_attrition).
+
+    The same frames are handed to every session and are read-only
+    (panel.ReadOnlyFrame): tabs request derived columns through
+    panel.derive_columns instead of assigning into these frames.
+    """
+    df, df_raw, df_attrition = (job.result() for job in jobs)
+    return df, df_raw, df_attrition
@@ -0,0 +1,273 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+
+from bounded_cache import cache
+from cache_utils import array_fingerprint
+from timing import mark_cache_miss
+
+# -----------------------------
+# Driver model features
+# -----------------------------
+RESIGNATION_FEATURES = ["Tenure", "Position/Level", "Generation", "Gender", "Promotion & Transfer"]
+PROMOTION_FEATURES = ["Tenure", "Position/Level", "Generation", "Gender"]
+CATEGORICAL_FEATURES = ["Position/Level", "Generation", "Gender"]
+TARGET_FEATURES = {"resignation": RESIGNATION_FEATURES, "promotion": PROMOTION_FEATURES}
+TARGET_LABELS = {"resignation": "Resigned", "promotion": "Promoted"}
+
+# -----------------------------
+# Driver forest sizes (incremental refresh grows up to MAX_DRIVER_TREES)
+# -----------------------------
+DRIVER_TREES = 100
+MIN_NEW_TREES = 5
+MAX_DRIVER_TREES = 300
+
+# -----------------------------
+# Bootstrap settings for driver importance intervals
+# -----------------------------
+N_BOOTSTRAP = 50
+BOOTSTRAP_TREES = 50
+CI_LEVEL = 0.95
+
+# Build pipeline output read by the Survey tab's precomputed drivers mode
+PRECOMPUTED_DRIVERS_FILE = "Driver_Importances.xlsx"
+PRECOMPUTED_SHEETS = {"resignation": "Driver-Resignation", "promotion": "Driver-Promotion"}
+
+# joblib workers for model fits, leaving cores for the request threads
+MODEL_JOBS = max(1, (os.cpu_count() or 1) // 2)
+
+# One background worker keeps bootstrap jobs off the request path; each job
+# fans out across MODEL_JOBS cores through joblib. Only jobs still running
+# are held here; finished bounds move to the "models" namespace of the
+# budgeted cache.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver-ci")
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+# Last fitted driver forest per (target, year) for incremental refresh, held
+# in the "models" namespace of the budgeted cache (evicted like any model)
+MODELS = "models"
+_models_lock = threading.Lock()
+
+
+def category_levels(df, columns=CATEGORICAL_FEATURES):
+    """Sorted labels per categorical column (same codes LabelEncoder would assign)"""
+    return {col: sorted(df[col].astype(str).unique()) for col in columns}
+
+
+def encode_features(df, features, levels):
+    """Encode features into a float32 matrix using fixed category levels.
+
+    Labels missing from levels and non-numeric values become NaN.
+    """
+    X = np.empty((len(df), len(features)), dtype=np.float32)
+    for i, col in enumerate(features):
+        if col in levels:
+            codes = pd.Categorical(df[col].astype(str), categories=levels[col]).codes
+            X[:, i] = np.where(codes < 0, np.nan, codes)
+        else:
+            X[:, i] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+    return X
+
+
+def driver_matrix(df_raw, selected_year, target, levels):
+    """Encoded float32 features and 0/1 target for a year slice (or "All").
+
+    Resignation uses every employee; promotion only active employees. Rows
+    with missing feature values are dropped.
+    """
+    status = df_raw["Resignee Checking"].astype(str).str.strip().str.upper()
+    mask = pd.Series(True, index=df_raw.index)
+    if selected_year != "All":
+        mask &= df_raw["Year"] == int(selected_year)
+
+    if target == "resignation":
+        y = status != "ACTIVE"
+    else:
+        mask &= status == "ACTIVE"
+        y = df_raw["Promotion & Transfer"].astype(str).str.strip().str.upper().isin({"1", "YES", "TRUE"})
+
+    X = encode_features(df_raw[mask], TARGET_FEATURES[target], levels)
+    y = y[mask].to_numpy(dtype=np.int8)
+
+    complete = ~np.isnan(X).any(axis=1)
+    return X[complete], y[complete]
+
+
+def driver_correlations(X, y, features, label):
+    """Correlation of each feature with the target, high to low"""
+    df_encoded = pd.DataFrame(np.column_stack([X, y]), columns=features + [label])
+    return df_encoded.corr()[label].drop(label).sort_values(ascending=False)
+
+
+def fit_driver_model(X, y):
+    """Train the driver forest from scratch"""
+    rf = RandomForestClassifier(n_estimators=DRIVER_TREES, random_state=42)
+    rf.fit(X, y)
+    return rf
+
+
+def grow_driver_model(rf, X_new, y_new, n_total):
+    """Warm-start extra trees on appended rows; returns None when a full refit is needed.
+
+    New trees are sized by the appended rows' share of the data so they carry
+    the same weight in the averaged importances as in a full refit.
+    """
+    n_old = n_total - len(y_new)
+    if n_old <= 0 or set(np.unique(y_new)) != set(rf.classes_):
+        return None
+
+    n_new_trees = max(MIN_NEW_TREES, round(rf.n_estimators * len(y_new) / n_old))
+    if rf.n_estimators + n_new_trees > MAX_DRIVER_TREES:
+        return None
+
+    rf.set_params(warm_start=True, n_estimators=rf.n_estimators + n_new_trees)
+    rf.fit(X_new, y_new)
+    return rf
+
+
+def refresh_driver_model(target, selected_year, X, y, fingerprint):
+    """Return a fitted forest for (target, year), reusing or growing the last one.
+
+    Unchanged data reuses the previous forest; rows appended after the data it
+    was fitted on are added by warm-starting new trees. Anything else (edited
+    history, new category codes) falls back to a full refit. Growing or
+    refitting marks the enclosing cached section as a miss.
+    """
+    key = ("driver_analysis.refresh_driver_model", (target, str(selected_year)))
+    n_rows = len(y)
+
+    with _models_lock:
+        found, entry = cache.get(MODELS, key)
+        if found:
+            rf, n_seen, seen_fingerprint = entry
+            if n_seen == n_rows and fingerprint == seen_fingerprint:
+                return rf
+            if n_seen < n_rows and array_fingerprint(X[:n_seen], y[:n_seen]) == seen_fingerprint:
+                mark_cache_miss()
+                grown = grow_driver_model(rf, X[n_seen:], y[n_seen:], n_rows)
+                if grown is not None:
+                    cache.put(MODELS, key, (grown, n_rows, fingerprint))
+                    return grown
+
+        mark_cache_miss()
+        rf = fit_driver_model(X, y)
+        cache.put(MODELS, key, (rf, n_rows, fingerprint))
+        return rf
+
+
+def importance_table(rf, features):
+    """Importances of a fitted forest sorted high to low"""
+    importance_df = pd.DataFrame({
+        "Driver": features,
+        "Importance": rf.feature_importances_
+    }).sort_values("Importance", ascending=False)
+
+    importance_df["Importance %"] = (importance_df["Importance"] * 100).round(1)
+    return importance_df
+
+
+def fit_importances(X, y, features):
+    """Train the driver forest and return importances sorted high to low"""
+    return importance_table(fit_driver_model(X, y), features)
+
+
+def precomputed_importances(table, selected_year, fingerprint, features):
+    """Look up precomputed importances; None when missing or built from other data"""
+    if table is None or table.empty:
+        return None
+
+    rows = table[(table["Year"].astype(str) == str(selected_year)) & (table["Fingerprint"] == fingerprint)]
+    if list(rows["Driver"]) != list(features):
+        return None
+
+    # Keep the feature-position index so bootstrap bounds still line up
+    importance_df = rows[["Driver", "Importance"]].reset_index(drop=True).sort_values("Importance", ascending=False)
+    importance_df["Importance %"] = (importance_df["Importance"] * 100).round(1)
+    return importance_df
+
+
+def score_risk(model, X):
+    """Resignation probability for every row of X in a single predict_proba call"""
+    classes = list(model.classes_)
+    if 1 not in classes:
+        return np.zeros(len(X), dtype=np.float32)
+    return model.predict_proba(X)[:, classes.index(1)]
+
+
+def _bootstrap_once(X, y, seed, n_estimators):
+    """Fit one forest on a bootstrap resample and return its importances"""
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(y), len(y))
+    rf = RandomForestClassifier(n_estimators=n_estimators, random_state=seed)
+    rf.fit(X[idx], y[idx])
+    return rf.feature_importances_
+
+
+def bootstrap_importances(X, y, n_boot=N_BOOTSTRAP, n_estimators=BOOTSTRAP_TREES, n_jobs=MODEL_JOBS):
+    """Return (lower, upper) importance bounds from parallel bootstrap refits"""
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+
+    draws = Parallel(n_jobs=n_jobs)(
+        delayed(_bootstrap_once)(X, y, seed, n_estimators) for seed in range(n_boot)
+    )
+    draws = np.vstack(draws)
+
+    alpha = (1 - CI_LEVEL) / 2
+    return np.quantile(draws, alpha, axis=0), np.quantile(draws, 1 - alpha, axis=0)
+
+
+def importance_intervals(target, selected_year, fingerprint, X, y):
+    """Get cached bootstrap bounds for a driver model, or None while they are computing.
+
+    The first call for a (target, year, data fingerprint) schedules the
+    bootstrap in the background and returns None; later reruns pick up the
+    finished result.
+    """
+    key = ("driver_analysis.importance_intervals", (target, str(selected_year), fingerprint))
+    found, bounds = cache.get(MODELS, key)
+    if found:
+        return bounds
+
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None:
+            _jobs[key] = _executor.submit(bootstrap_importances, X, y)
+            return None
+
+    if not job.done():
+        return None
+    with _jobs_lock:
+        _jobs.pop(key, None)
+    # Failed jobs are dropped so the next rerun retries them
+    if job.exception() is not None:
+        return None
+    bounds = job.result()
+    cache.put(MODELS, key, bounds)
+    return bounds
+
+
+def error_bars(importance_df, bounds):
+    """Build a Plotly error_x spec (in %) aligned with importance_df rows"""
+    if bounds is None:
+        return None
+
+    lower, upper = bounds
+    # importance_df is sorted by importance; realign bounds to its row order
+    order = importance_df.index.to_numpy()
+    point = importance_df["Importance"].to_numpy()
+    return {
+        "type": "data",
+        "symmetric": False,
+        "array": (np.clip(upper[order] - point, 0, None) * 100).round(1),
+        "arrayminus": (np.clip(point - lower[order], 0, None) * 100).round(1),
+        "color": "#808080",
+        "thickness": 1.5,
+        "width": 4,
+    }
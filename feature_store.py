@@ -0,0 +1,24 @@
+from driver_analysis import category_levels, driver_matrix
+from panel import PANEL_HASH_FUNCS
+from timing import timed, mark_cache_miss
+from bounded_cache import bounded_cache
+
+
+@timed("get_category_levels", cached=True)
+@bounded_cache("aggregates", hash_funcs=PANEL_HASH_FUNCS)
+def get_category_levels(df_raw):
+    """Fixed category codes for the whole panel, shared by all driver and risk models"""
+    mark_cache_miss()
+    return category_levels(df_raw)
+
+
+@timed("get_feature_matrix", cached=True)
+@bounded_cache("aggregates", hash_funcs=PANEL_HASH_FUNCS)
+def get_feature_matrix(df_raw, selected_year, target):
+    """Encoded float32 feature matrix and target for "resignation" or "promotion", built once per data version and year"""
+    mark_cache_miss()
+    X, y = driver_matrix(df_raw, selected_year, target, get_category_levels(df_raw))
+    # Shared by every caller, so read-only
+    X.flags.writeable = False
+    y.flags.writeable = False
+    return X, y
@@ -0,0 +1,50 @@
+import json
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from timing import section, mark_cache_miss
+from bounded_cache import cache
+
+# -----------------------------
+# Serialized Plotly figures shared across sessions, keyed by
+# (chart id, data version, filter tuple) and held in the "figures" namespace
+# of the budgeted cache (LRU eviction by size)
+# -----------------------------
+FIGURES = "figures"
+
+
+def cached_figure(chart_id, filters, build, data_version=None):
+    """Return the figure for chart_id under the given filters, calling build() only on a miss.
+
+    build must return a Plotly figure (or None when there is nothing to plot,
+    which is not cached) and must not call Streamlit elements, since it is
+    skipped entirely when the figure is served from cache. data_version
+    defaults to the session's (pass it explicitly outside a session, e.g.
+    when prefetching).
+    """
+    if data_version is None:
+        data_version = st.session_state.get("data_version")
+    key = (FIGURES, chart_id, data_version, tuple(filters))
+    with section(f"figure:{chart_id}", cached=True):
+        return _cached_figure(key, build)
+
+
+def _cached_figure(key, build):
+    found, spec = cache.get(FIGURES, key)
+    if found:
+        # The spec was validated when first built; skip re-validation on the way back
+        return go.Figure(json.loads(spec), _validate=False)
+
+    mark_cache_miss()
+    fig = build()
+    if fig is None:
+        return None
+    spec = fig.to_json()
+    cache.put(FIGURES, key, spec, size=len(spec))
+    return fig
+
+
+def clear_figures():
+    """Drop every cached figure (e.g. after reloading source data)"""
+    cache.clear(FIGURES)
@@ -0,0 +1,198 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_loader import RAW_DATA_FILE, sheet_path
+
+# -----------------------------
+# Synthetic HR panels for load and scale testing: fits rates and
+# distributions from the real Data sheet and simulates employee-years at any
+# size with vectorized numpy. Dates are randomized the same way as test.py
+# (month 1-12, day 1-28, year kept). Output has the Data sheet's columns and
+# a matching Summary sheet, as .xlsx or .parquet (columnar; the Summary goes
+# to <name>.Summary.parquet).
+# Usage: python generate_hr_panel.py ROWS [OUTPUT]
+# Point the dashboard at the result with HR_RAW_DATA=OUTPUT.
+# -----------------------------
+SEED = 620
+BASE_COLUMNS = [
+    "Calendar Year", "Full Name", "Age", "Position/Level", "Year Joined", "Gender",
+    "Resignee Checking", "Resignation Date", "Generation", "Tenure", "Promotion & Transfer",
+]
+
+
+def fit_profile(df_raw):
+    """Yearly join/resignation rates and attribute distributions of a real panel"""
+    year = pd.to_datetime(df_raw["Calendar Year"]).dt.year
+    joined = pd.to_datetime(df_raw["Year Joined"]).dt.year
+    leaver = df_raw["Resignee Checking"].astype(str).str.strip().str.upper() == "LEAVER"
+    years = sorted(year.unique())
+
+    by_year = pd.DataFrame({
+        "rows": year.value_counts(),
+        "joins": year[joined == year].value_counts(),
+        "resignations": year[leaver].value_counts(),
+    }).reindex(years).fillna(0)
+
+    # Attributes at each employee's first appearance; sampled as whole rows so
+    # age, generation, gender and position stay jointly realistic
+    attributes = df_raw[["Age", "Gender", "Generation", "Position/Level"]].assign(
+        Gender=df_raw["Gender"].astype(str).str.strip().str.title(), new=(joined == year).to_numpy()
+    )
+    first = attributes.loc[df_raw.assign(Year=year).sort_values("Year", kind="stable").drop_duplicates("Full Name").index]
+
+    score_columns = [c for c in df_raw.columns if c not in BASE_COLUMNS and c != "Year"]
+    names = df_raw["Full Name"].astype(str).str.split()
+    return {
+        "years": years,
+        "join_share": (by_year["joins"] / by_year["rows"]).to_numpy(),
+        "resign_share": (by_year["resignations"] / by_year["rows"]).to_numpy(),
+        "starting_tenure": (years[0] - joined[(year == years[0]) & (joined < years[0])]).to_numpy(),
+        "starters": first[~first["new"]].drop(columns="new").reset_index(drop=True),
+        "joiners": first[first["new"]].drop(columns="new").reset_index(drop=True),
+        "promotion_rate": df_raw.groupby("Position/Level")["Promotion & Transfer"].mean().to_dict(),
+        "scores": {
+            column: {
+                status: df_raw.loc[leaver == status, column].value_counts(normalize=True).sort_index()
+                for status in (False, True)
+            }
+            for column in score_columns
+        },
+        "first_names": names.str[0].unique(),
+        "last_names": names.str[-1].unique(),
+    }
+
+
+def _random_dates(rng, years):
+    # As in test.py: keep the year, randomize month and day (1-28 avoids invalid dates)
+    months = rng.integers(1, 13, len(years))
+    days = rng.integers(1, 29, len(years))
+    return pd.to_datetime({"year": years, "month": months, "day": days}), months
+
+
+def _new_staff(rng, pool, n, first_id, first_year):
+    staff = pool.iloc[rng.integers(0, len(pool), n)].reset_index(drop=True)
+    staff["id"] = np.arange(first_id, first_id + n)
+    staff["first_year"] = first_year
+    return staff
+
+
+def _sample(rng, distribution, n):
+    """n draws from a value -> probability Series"""
+    picks = np.searchsorted(distribution.cumsum().to_numpy(), rng.random(n), side="right")
+    return distribution.index.to_numpy()[np.minimum(picks, len(distribution) - 1)]
+
+
+def generate_panel(n_rows, profile, seed=SEED):
+    """Synthetic (data, summary) with about n_rows employee-years"""
+    rng = np.random.default_rng(seed)
+    years = profile["years"]
+
+    # Rows produced per starting employee, to size the first year's headcount
+    starting, rows_per_starter = 1.0, 0.0
+    for join_share, resign_share in zip(profile["join_share"], profile["resign_share"]):
+        total = starting / (1 - join_share)
+        rows_per_starter += total
+        starting = total * (1 - resign_share)
+    n_start = max(1, round(n_rows / rows_per_starter))
+
+    staff = _new_staff(rng, profile["starters"], n_start, 0, years[0])
+    tenure = rng.choice(profile["starting_tenure"], n_start) if len(profile["starting_tenure"]) else np.ones(n_start, int)
+    staff["joined"], staff["join_month"] = _random_dates(rng, years[0] - tenure)
+    next_id = n_start
+
+    frames, summary = [], []
+    for year, join_share, resign_share in zip(years, profile["join_share"], profile["resign_share"]):
+        n_joins = round(len(staff) * join_share / (1 - join_share))
+        joiners = _new_staff(rng, profile["joiners"], n_joins, next_id, year)
+        joiners["joined"], joiners["join_month"] = _random_dates(rng, np.full(n_joins, year))
+        next_id += n_joins
+        staff = pd.concat([staff, joiners], ignore_index=True)
+
+        n = len(staff)
+        leaver = rng.random(n) < resign_share
+        joined_now = staff["joined"].dt.year.to_numpy() == year
+        # Same-year joiners cannot resign before they joined
+        months = np.where(joined_now, rng.integers(staff["join_month"].to_numpy(), 13), rng.integers(1, 13, n))
+        resigned = pd.to_datetime({"year": np.full(n, year), "month": months, "day": np.ones(n, int)})
+
+        frame = pd.DataFrame({
+            "Calendar Year": pd.Timestamp(year=year, month=1, day=1),
+            # Employee ids for now; replaced by names once every employee exists
+            "Full Name": staff["id"].to_numpy(),
+            "Age": (staff["Age"] + year - staff["first_year"]).to_numpy(),
+            "Position/Level": staff["Position/Level"].to_numpy(),
+            "Year Joined": staff["joined"].to_numpy(),
+            "Gender": staff["Gender"].to_numpy(),
+            "Resignee Checking": np.where(leaver, "LEAVER", "ACTIVE"),
+            "Resignation Date": resigned.where(leaver).to_numpy(),
+            "Generation": staff["Generation"].to_numpy(),
+            "Tenure": (year - staff["joined"].dt.year).to_numpy(dtype="int64"),
+            "Promotion & Transfer": (
+                rng.random(n) < staff["Position/Level"].map(profile["promotion_rate"]).fillna(0).to_numpy()
+            ).astype(int),
+        })
+        for column, distributions in profile["scores"].items():
+            values = np.empty(n, dtype=distributions[False].index.dtype)
+            for status in (False, True):
+                values[leaver == status] = _sample(rng, distributions[status], int((leaver == status).sum()))
+            frame[column] = values
+        frames.append(frame)
+
+        summary.append({
+            "Year": year,
+            "Starting Headcount": n - n_joins,
+            "Joins": n_joins,
+            "Resignations": int(leaver.sum()),
+            "Ending Headcount": n - int(leaver.sum()),
+        })
+        staff = staff[~leaver].reset_index(drop=True)
+
+    data = pd.concat(frames, ignore_index=True)
+
+    # Employees keep one name across years; the id suffix keeps names unique
+    # (tabs deduplicate leavers by Full Name)
+    ids = data["Full Name"].to_numpy()
+    first = profile["first_names"][rng.integers(0, len(profile["first_names"]), next_id)]
+    last = profile["last_names"][rng.integers(0, len(profile["last_names"]), next_id)]
+    initial = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))[rng.integers(0, 26, next_id)]
+    names = pd.Series(first) + " " + initial + ". " + pd.Series(last) + " " + pd.Series(np.arange(next_id)).astype(str).str.zfill(7)
+    data["Full Name"] = names.to_numpy()[ids]
+
+    summary = pd.DataFrame(summary)
+    start, end = summary["Starting Headcount"], summary["Ending Headcount"]
+    summary["Retention Rate (%)"] = (start - summary["Resignations"]) / start * 100
+    summary["Attrition Rate(%)"] = summary["Resignations"] / ((start + end) / 2) * 100
+    summary["Net Change"] = end - start
+    summary["Total Headcount"] = start + summary["Joins"]
+    return data, summary
+
+
+def write_panel(data, summary, path):
+    """Write the Data and Summary sheets as .xlsx or .parquet"""
+    if path.endswith(".parquet"):
+        data.to_parquet(sheet_path(path, "Data"), index=False)
+        summary.to_parquet(sheet_path(path, "Summary"), index=False)
+    else:
+        with pd.ExcelWriter(path) as writer:
+            data.to_excel(writer, sheet_name="Data", index=False)
+            summary.to_excel(writer, sheet_name="Summary", index=False)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python generate_hr_panel.py ROWS [OUTPUT.xlsx|OUTPUT.parquet]")
+    n_rows = int(sys.argv[1])
+    output = sys.argv[2] if len(sys.argv) > 2 else f"synthetic_hr_{n_rows}.parquet"
+
+    source = pd.read_excel(RAW_DATA_FILE, sheet_name="Data")
+    start = time.perf_counter()
+    data, summary = generate_panel(n_rows, fit_profile(source))
+    generated = time.perf_counter() - start
+    write_panel(data, summary, output)
+
+    print(f"{len(data):,} employee-years ({data['Full Name'].nunique():,} employees) generated in {generated:.1f}s")
+    print(summary.to_string(index=False))
+    print(f"Written to {output}")
@@ -0,0 +1,149 @@
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+from streamlit.runtime import Runtime
+from streamlit.testing.v1 import AppTest
+
+# Concurrent-session load test: N simulated viewers share one instance of
+# web_app.py (one process, like a Streamlit server) and click through tabs,
+# years and month filters with no think time. Reports rerun latency
+# percentiles, throughput, CPU and memory as N grows.
+# Usage: python load_test.py [N ...] [--actions K] [--seed S]
+# Run with HR_RAW_DATA=<panel> to load-test a generate_hr_panel.py dataset.
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web_app.py")
+RESULTS = "load_test_results.json"
+YEARS = ["All"] + list(range(2020, 2026))
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+
+
+def option(name, default):
+    if name in sys.argv:
+        return int(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+args = [a for i, a in enumerate(sys.argv[1:], 1) if not a.startswith("--") and not sys.argv[i - 1].startswith("--")]
+SESSION_COUNTS = [int(a) for a in args] or [1, 2, 4, 8, 16]
+ACTIONS = option("--actions", 8)
+SEED = option("--seed", 620)
+
+
+# AppTest installs a mock Runtime for each run and removes it when the run
+# ends, which pulls it out from under the other sessions' overlapping runs;
+# fall back to the last one installed
+_last_runtime = []
+
+
+def _shared_instance(cls):
+    if cls._instance is not None:
+        _last_runtime[:] = [cls._instance]
+    return cls._instance or _last_runtime[0]
+
+
+Runtime.instance = classmethod(_shared_instance)
+
+
+def rss_mib():
+    # Current resident set size (Linux); peak comes from getrusage
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def peak_rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def next_action(rng, at):
+    """Pick a click like a viewer would: another tab, another year, or a month filter"""
+    choices = ["tab", "year"]
+    if at.session_state["active_tab"] == 1:
+        choices.append("months")
+    action = rng.choice(choices)
+    if action == "tab":
+        at.button(key=f"tab_{rng.choice([t for t in range(5) if t != at.session_state['active_tab']])}").click()
+    elif action == "year":
+        at.radio(key="selected_year").set_value(rng.choice(YEARS))
+    else:
+        at.multiselect(key="resigned_month_dropdown").set_value(rng.sample(MONTHS, rng.randint(1, 3)))
+    return action
+
+
+def session(index, start, samples, errors):
+    rng = random.Random(SEED * 1000 + index)
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.query_params["active_tab"] = str(rng.randrange(5))
+    start.wait()
+
+    action = "open"
+    for step in range(ACTIONS + 1):
+        if step:
+            action = next_action(rng, at)
+        began = time.perf_counter()
+        at.run()
+        samples.append((action, time.perf_counter() - began))
+        errors.extend(f"session {index}, {action}: {exc.value.splitlines()[0]}" for exc in at.exception)
+
+
+def run_load(n_sessions):
+    samples, errors = [], []
+    start = threading.Barrier(n_sessions + 1)
+    threads = [threading.Thread(target=session, args=(i, start, samples, errors)) for i in range(n_sessions)]
+    for thread in threads:
+        thread.start()
+
+    start.wait()
+    wall, cpu = time.perf_counter(), time.process_time()
+    for thread in threads:
+        thread.join()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    latencies = np.array([latency for _, latency in samples])
+    return {
+        "sessions": n_sessions,
+        "reruns": len(samples),
+        "errors": len(errors),
+        "p50_s": round(float(np.percentile(latencies, 50)), 3),
+        "p90_s": round(float(np.percentile(latencies, 90)), 3),
+        "p99_s": round(float(np.percentile(latencies, 99)), 3),
+        "max_s": round(float(latencies.max()), 3),
+        "reruns_per_s": round(len(samples) / wall, 2),
+        "cpu_pct": round(cpu / wall * 100, 1),
+        "rss_mib": round(rss_mib(), 1),
+        "peak_rss_mib": round(peak_rss_mib(), 1),
+        "by_action_p50_s": {
+            action: round(float(np.median([latency for a, latency in samples if a == action])), 3)
+            for action in sorted({a for a, _ in samples})
+        },
+    }, errors
+
+
+# Load the workbooks once so every step measures a warm server with N viewers
+AppTest.from_file(APP, default_timeout=600).run()
+print(f"{os.cpu_count()} CPU(s); server warmed, RSS {rss_mib():.0f} MiB; {ACTIONS} actions per session\n")
+print(f"{'N':>4} {'reruns':>7} {'err':>4} {'p50 s':>7} {'p90 s':>7} {'p99 s':>7} {'max s':>7} "
+      f"{'rerun/s':>8} {'CPU %':>6} {'RSS MiB':>8} {'peak MiB':>9}")
+
+results, all_errors = [], []
+for n_sessions in SESSION_COUNTS:
+    result, errors = run_load(n_sessions)
+    results.append(result)
+    all_errors += errors
+    print(f"{result['sessions']:>4} {result['reruns']:>7} {result['errors']:>4} {result['p50_s']:>7.2f} "
+          f"{result['p90_s']:>7.2f} {result['p99_s']:>7.2f} {result['max_s']:>7.2f} {result['reruns_per_s']:>8.2f} "
+          f"{result['cpu_pct']:>6.0f} {result['rss_mib']:>8.0f} {result['peak_rss_mib']:>9.0f}")
+
+with open(RESULTS, "w") as f:
+    json.dump(results, f, indent=2)
+print(f"\nPer-action medians and raw numbers written to {RESULTS}")
+
+if all_errors:
+    print("\n".join(all_errors[:20]))
+    sys.exit(f"{len(all_errors)} rerun(s) raised under load")
@@ -0,0 +1,170 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+# -----------------------------
+# Opt-in memory profiling: with ?memprofile=1 (or DASHBOARD_MEMPROFILE=1 for
+# every session) each tab render is wrapped in tracemalloc snapshots. Each
+# render reports its peak, the allocation sites still holding memory when it
+# returned, and the growth since the previous profiled render of the same tab
+# (memory retained across reruns). Reports are appended to MEMORY_LOG.
+# tracemalloc traces the whole process once started, and its peak is
+# process-wide too: profiled renders therefore run one at a time, and
+# allocations made meanwhile by unprofiled sessions and the prefetch threads
+# are still included.
+# -----------------------------
+MEMPROFILE_PARAM = "memprofile"
+MEMORY_LOG = "memory_profile.jsonl"
+# Deep enough to reach the dashboard's own line through pandas/plotly internals
+TRACE_FRAMES = 16
+TOP_SITES = 15
+# tracemalloc slows every allocation in the process; stop it once no
+# session has asked for a memory profile for this long
+IDLE_STOP_S = 300
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bytes held per allocation site after the last profiled render of each tab
+# (not whole snapshots), for growth between reruns
+_previous = {}
+_lock = threading.Lock()
+# One profiled render at a time, so reset_peak() in one does not cut into another's peak
+_render_lock = threading.Lock()
+_last_profiled = 0.0
+# Whether tracing was started here (never stop someone else's tracemalloc)
+_started = False
+
+_IGNORED = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    # The per-site totals kept in _previous
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def memprofile_enabled():
+    return os.environ.get("DASHBOARD_MEMPROFILE") == "1" or st.query_params.get(MEMPROFILE_PARAM) in ("1", "true")
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+
+def _site(frame):
+    return f"{os.path.relpath(frame.filename, APP_DIR) if frame.filename.startswith(APP_DIR) else os.path.basename(frame.filename)}:{frame.lineno}"
+
+
+def _app_site(traceback):
+    """Innermost line of dashboard code that led to an allocation (or the allocation itself)"""
+    # Tracebacks run from the oldest frame to the allocation itself
+    app_frame = next((f for f in reversed(traceback) if f.filename.startswith(APP_DIR)), None)
+    return _site(app_frame or traceback[-1])
+
+
+def _top_sites(stats, limit=TOP_SITES):
+    """Largest memory growth of a snapshot comparison, grouped by _app_site"""
+    sites = {}
+    for stat in stats:
+        if stat.size_diff <= 0:
+            continue
+        key = _app_site(stat.traceback)
+        site = sites.setdefault(key, {"site": key, "kib": 0.0, "count": 0, "via": _site(stat.traceback[-1])})
+        site["kib"] += stat.size_diff / 1024
+        site["count"] += stat.count_diff
+    top = sorted(sites.values(), key=lambda site: site["kib"], reverse=True)[:limit]
+    return [dict(site, kib=round(site["kib"], 1)) for site in top]
+
+
+def _site_sizes(snapshot):
+    """Bytes held per _app_site in a snapshot"""
+    sizes = {}
+    for stat in snapshot.statistics("traceback"):
+        key = _app_site(stat.traceback)
+        sizes[key] = sizes.get(key, 0) + stat.size
+    return sizes
+
+
+def _growth(sizes, previous, limit=TOP_SITES):
+    """Sites holding more memory than after the previous render"""
+    grown = [
+        {"site": key, "kib": round((size - previous.get(key, 0)) / 1024, 1)}
+        for key, size in sizes.items() if size > previous.get(key, 0)
+    ]
+    return sorted(grown, key=lambda site: site["kib"], reverse=True)[:limit]
+
+
+def _stop_if_idle():
+    global _started
+    if _started and time.time() - _last_profiled > IDLE_STOP_S:
+        _started = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        with _lock:
+            _previous.clear()
+
+
+@contextmanager
+def tab_memory_profile(tab):
+    """Profile the allocations of one tab render (no-op unless memory profiling is on)"""
+    global _last_profiled, _started
+    if not memprofile_enabled():
+        _stop_if_idle()
+        yield None
+        return
+
+    _last_profiled = time.time()
+    report = {"tab": tab, "year": str(st.session_state.get("selected_year"))}
+    with _render_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            _started = True
+        before = _snapshot()
+        tracemalloc.reset_peak()
+        start_traced = tracemalloc.get_traced_memory()[0]
+        try:
+            yield report
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = _snapshot()
+            sizes = _site_sizes(after)
+            with _lock:
+                previous = _previous.get(tab)
+                _previous[tab] = sizes
+
+            report.update({
+                "ts": round(time.time(), 3),
+                "peak_mib": round((peak - start_traced) / 2**20, 2),
+                "net_kib": round((current - start_traced) / 1024, 1),
+                "render_sites": _top_sites(after.compare_to(before, "traceback")),
+                "growth_since_last": _growth(sizes, previous) if previous is not None else None,
+            })
+            del before, after
+        try:
+            with _lock, open(MEMORY_LOG, "a") as f:
+                f.write(json.dumps(report) + "\n")
+        except OSError:
+            pass
+
+
+def render_memory_report(report):
+    """Show a tab render's memory report (memory profiling mode only)"""
+    if report is None or "peak_mib" not in report:
+        return
+    with st.expander("🧠 Memory profile (memprofile mode)", expanded=True):
+        st.caption(
+            f"Render of {report['tab']} ({report['year']}): peak {report['peak_mib']} MiB above the start, "
+            f"{report['net_kib']} KiB still held afterwards. Appended to {MEMORY_LOG}."
+        )
+        st.markdown("**Allocation sites of this render** (KiB still held when it returned)")
+        st.dataframe(pd.DataFrame(report["render_sites"]), use_container_width=True, hide_index=True)
+        if report["growth_since_last"] is not None:
+            st.markdown("**Growth since the previous render of this tab** (retained across reruns)")
+            st.dataframe(pd.DataFrame(report["growth_since_last"]), use_container_width=True, hide_index=True)
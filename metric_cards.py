@@ -0,0 +1,51 @@
+import html
+
+import streamlit as st
+
+
+# -----------------------------
+# KPI cards: a whole row of cards is one markdown element, instead of a
+# column + bordered container + label/value markdown per card
+# -----------------------------
+def _card_html(label, value, delta=None):
+    """HTML for one card (label, value and optional delta)"""
+    parts = [
+        f"<div class='metric-label'>{html.escape(str(label))}</div>",
+        f"<div class='metric-value'>{html.escape(str(value))}</div>",
+    ]
+    if delta is not None and delta != "":
+        text = str(delta)
+        direction = "down" if text.startswith("-") else "up"
+        parts.append(f"<div class='metric-delta metric-delta-{direction}'>{html.escape(text)}</div>")
+    return "".join(parts)
+
+
+def metric_row(items, bordered=True):
+    """Render (label, value[, delta]) items as one row of metric cards.
+
+    bordered=False gives the plain mini-metrics used above breakdown charts.
+    """
+    cards = []
+    for item in items:
+        label, value, delta = (tuple(item) + (None,))[:3]
+        cards.append(f"<div class='metric-card'>{_card_html(label, value, delta)}</div>")
+
+    row_class = "metric-row" if bordered else "metric-row metric-row-plain"
+    st.markdown(f"<div class='{row_class}'>{''.join(cards)}</div>", unsafe_allow_html=True)
+
+
+def loading_skeleton(n_cards=3, n_charts=2, chart_height=260):
+    """Placeholder KPI cards and chart blocks shown while data is loading"""
+    cards = "".join(
+        "<div class='metric-card'><div class='skeleton skeleton-line'></div>"
+        "<div class='skeleton skeleton-value'></div></div>"
+        for _ in range(n_cards)
+    )
+    charts = "".join(
+        f"<div class='metric-card'><div class='skeleton' style='height: {chart_height}px;'></div></div>"
+        for _ in range(n_charts)
+    )
+    st.markdown(
+        f"<div class='metric-row'>{cards}</div><div class='metric-row'>{charts}</div>",
+        unsafe_allow_html=True
+    )
@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cache_stats import namespace_usage, snapshot
+
+# -----------------------------
+# Prometheus metrics: reruns and rerun latency per tab, tab render time,
+# data load and model training time, and cache sizes, in the text
+# exposition format. Written to METRICS_FILE (node_exporter textfile
+# collector compatible) and served on 127.0.0.1:DASHBOARD_METRICS_PORT when
+# that variable is set.
+# -----------------------------
+METRICS_FILE = "dashboard_metrics.prom"
+METRICS_PORT = os.environ.get("DASHBOARD_METRICS_PORT")
+WRITE_INTERVAL_S = 5
+
+# Histogram buckets in seconds
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Sections timed as model training (cache hits are not training)
+TRAINING_SECTIONS = {
+    "train_resignation_model": "resignation_risk",
+    "driver_model:resignation": "resignation_drivers",
+    "driver_model:promotion": "promotion_drivers",
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_last_write = 0.0
+_server = None
+
+
+def _observe(name, labels, seconds):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram["buckets"][i] += 1
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+
+
+def _increment(name, labels, value=1):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe_rerun(tab, seconds):
+    """A completed rerun of the app script"""
+    _increment("dashboard_reruns_total", {"tab": tab})
+    _observe("dashboard_rerun_seconds", {"tab": tab}, seconds)
+    write_metrics()
+
+
+def observe_section(name, ms, cache):
+    """A timed section (fed by timing.section); only some are exported"""
+    seconds = ms / 1000
+    if name.startswith("render:"):
+        _observe("dashboard_tab_render_seconds", {"tab": name.split(":", 1)[1].split(" ", 1)[-1]}, seconds)
+    elif name == "load_data" and cache == "miss":
+        _observe("dashboard_data_load_seconds", {}, seconds)
+    elif name in TRAINING_SECTIONS and cache != "hit":
+        _observe("dashboard_model_training_seconds", {"model": TRAINING_SECTIONS[name]}, seconds)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+HELP = {
+    "dashboard_reruns_total": ("counter", "Completed reruns of the dashboard script"),
+    "dashboard_rerun_seconds": ("histogram", "Wall time of a full rerun"),
+    "dashboard_tab_render_seconds": ("histogram", "Wall time of the active tab's render()"),
+    "dashboard_data_load_seconds": ("histogram", "Time waiting for the workbooks to load (cold loads only)"),
+    "dashboard_model_training_seconds": ("histogram", "Model training time"),
+    "dashboard_cache_hits_total": ("counter", "Cache hits per cached section"),
+    "dashboard_cache_misses_total": ("counter", "Cache misses per cached section"),
+    "dashboard_cache_entries": ("gauge", "Entries held per cached section"),
+    "dashboard_cache_bytes": ("gauge", "Approximate bytes held per cached section"),
+    "dashboard_cache_namespace_bytes": ("gauge", "Bytes held per budgeted cache namespace"),
+    "dashboard_cache_namespace_quota_bytes": ("gauge", "Byte quota per budgeted cache namespace"),
+    "dashboard_cache_evictions_total": ("counter", "Evictions per budgeted cache namespace"),
+}
+
+
+def render_metrics():
+    """All metrics in the Prometheus text format"""
+    samples = {name: [] for name in HELP}
+    with _lock:
+        for (name, labels), value in _counters.items():
+            samples[name].append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), histogram in _histograms.items():
+            for bound, count in zip(BUCKETS, histogram["buckets"]):
+                samples[name].append(f"{name}_bucket{_labels(labels + (('le', bound),))} {count}")
+            samples[name].append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+            samples[name].append(f"{name}_sum{_labels(labels)} {histogram['sum']:.6f}")
+            samples[name].append(f"{name}_count{_labels(labels)} {histogram['count']}")
+
+    for cache in snapshot():
+        labels = (("cache", cache["cache"]),)
+        samples["dashboard_cache_hits_total"].append(f"dashboard_cache_hits_total{_labels(labels)} {cache['hits']}")
+        samples["dashboard_cache_misses_total"].append(f"dashboard_cache_misses_total{_labels(labels)} {cache['misses']}")
+        if cache["entries"] is not None:
+            samples["dashboard_cache_entries"].append(f"dashboard_cache_entries{_labels(labels)} {cache['entries']}")
+        if cache["bytes"] is not None:
+            samples["dashboard_cache_bytes"].append(f"dashboard_cache_bytes{_labels(labels)} {cache['bytes']}")
+    for usage in namespace_usage():
+        labels = _labels((("namespace", usage["namespace"]),))
+        samples["dashboard_cache_namespace_bytes"].append(f"dashboard_cache_namespace_bytes{labels} {usage['bytes']}")
+        samples["dashboard_cache_namespace_quota_bytes"].append(
+            f"dashboard_cache_namespace_quota_bytes{labels} {usage['quota_bytes']}"
+        )
+        samples["dashboard_cache_evictions_total"].append(f"dashboard_cache_evictions_total{labels} {usage['evictions']}")
+
+    lines = []
+    for name, (kind, description) in HELP.items():
+        if samples[name]:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"] + samples[name]
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(force=False):
+    """Rewrite METRICS_FILE (at most every WRITE_INTERVAL_S unless forced)"""
+    global _last_write
+    now = time.time()
+    with _lock:
+        if not force and now - _last_write < WRITE_INTERVAL_S:
+            return
+        _last_write = now
+    tmp = f"{METRICS_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            f.write(render_metrics())
+        os.replace(tmp, METRICS_FILE)
+    except OSError:
+        pass
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_metrics().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port=METRICS_PORT):
+    """Start the /metrics endpoint once per process (no-op when no port is configured)"""
+    global _server
+    if not port:
+        return None
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+            except OSError:
+                # Port taken (e.g. by another server process); the file still updates
+                _server = False
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server or None
@@ -0,0 +1,161 @@
+import functools
+import inspect
+
+import pandas as pd
+import streamlit as st
+
+from timing import section, mark_cache_miss
+from bounded_cache import bounded_cache
+
+# -----------------------------
+# Read-only panels: the loaded workbooks and the cached views derived from
+# them are shared by every session, so writes into them raise instead of
+# silently changing another session's data. Anything derived from a
+# read-only panel (filters, groupby, assign, copy) is an ordinary frame.
+# -----------------------------
+# Derived frames must never write through to the shared data they came from
+# (copy-on-write is always on from pandas 3; pandas 2 needs the option)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+class ReadOnlyPanelError(TypeError):
+    """Raised when code assigns into a shared read-only panel"""
+
+
+def _read_only(*args, **kwargs):
+    raise ReadOnlyPanelError(
+        "Shared panels are read-only; derive new columns with panel.derive_columns() "
+        "or work on a filtered/assigned copy"
+    )
+
+
+class _ReadOnlyIndexer:
+    """Wraps .loc/.iloc/.at/.iat: reads pass through, writes raise"""
+
+    def __init__(self, indexer):
+        self._indexer = indexer
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    def __call__(self, *args, **kwargs):
+        return _ReadOnlyIndexer(self._indexer(*args, **kwargs))
+
+    __setitem__ = _read_only
+
+
+class ReadOnlyFrame(pd.DataFrame):
+    """DataFrame that rejects column assignment and in-place edits"""
+
+    @property
+    def _constructor(self):
+        # Results of operations on a read-only panel are normal frames
+        return pd.DataFrame
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    insert = _read_only
+    pop = _read_only
+    _update_inplace = _read_only
+
+    def __setattr__(self, name, value):
+        if "_mgr" in self.__dict__ and (name in ("columns", "index") or name in self.columns):
+            _read_only()
+        super().__setattr__(name, value)
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc)
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc)
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at)
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat)
+
+
+def _reject_inplace(method):
+    # pandas edits the data before _update_inplace runs, so inplace=True has
+    # to be refused before the method starts
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            _read_only()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+for _name in dir(pd.DataFrame):
+    _method = getattr(pd.DataFrame, _name)
+    if not _name.startswith("_") and callable(_method) and not isinstance(_method, type):
+        try:
+            if "inplace" in inspect.signature(_method).parameters:
+                setattr(ReadOnlyFrame, _name, _reject_inplace(_method))
+        except (TypeError, ValueError):
+            pass
+
+
+def panel_hash(frame):
+    """Cache key for a read-only panel (Streamlit only hashes plain DataFrames).
+
+    Computed once per panel object: its contents cannot change, and hashing
+    the full panel on every cache hit cost more than the hit saved.
+    """
+    key = frame.__dict__.get("_panel_hash")
+    if key is None:
+        key = (
+            tuple(frame.columns),
+            tuple(str(dtype) for dtype in frame.dtypes),
+            pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes(),
+        )
+        object.__setattr__(frame, "_panel_hash", key)
+    return key
+
+
+# hash_funcs for cached functions that take shared panels as arguments
+PANEL_HASH_FUNCS = {ReadOnlyFrame: panel_hash}
+
+
+def freeze(frame):
+    """Read-only view of a DataFrame (or of each frame in a dict of sheets)"""
+    if isinstance(frame, dict):
+        return {name: freeze(sheet) for name, sheet in frame.items()}
+    if frame is None or isinstance(frame, ReadOnlyFrame):
+        return frame
+    return ReadOnlyFrame(frame.copy(deep=False))
+
+
+# -----------------------------
+# Derived columns: tabs ask for the columns they need instead of writing
+# them into the shared panel
+# -----------------------------
+@bounded_cache("raw", hash_funcs=PANEL_HASH_FUNCS)
+def _derived_view(name, build_id, data_version, frame, _build):
+    mark_cache_miss()
+    return freeze(_build(frame))
+
+
+def derive_columns(name, frame, build, data_version=None):
+    """Shared read-only view of frame with the columns returned by build(frame).
+
+    build returns a dict of column name -> values (new or replacing
+    existing columns) or a whole DataFrame. The view is built once per
+    (name, build function, data version, frame contents) and reused by
+    every session.
+    """
+    if data_version is None:
+        data_version = st.session_state.get("data_version")
+
+    def build_view(source):
+        result = build(source)
+        return result if isinstance(result, pd.DataFrame) else source.assign(**result)
+
+    with section(f"derive:{name}", rows=len(frame), cached=True):
+        return _derived_view(name, f"{build.__module__}.{build.__qualname__}", data_version, frame, build_view)
@@ -0,0 +1,74 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# -----------------------------
+# Background prefetch: after a rerun, warm the caches of the tabs that are
+# not on screen for the current year so switching tabs is a cache hit
+# -----------------------------
+PREFETCH_WORKERS = 2
+
+_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+_scheduled = {}
+_scheduled_lock = threading.Lock()
+
+
+class _PrefetchThreadFilter(logging.Filter):
+    """Drop Streamlit's "missing ScriptRunContext" warnings from prefetch
+    threads; cached functions work without a script context"""
+
+    def filter(self, record):
+        return not threading.current_thread().name.startswith("prefetch")
+
+
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(_PrefetchThreadFilter())
+
+
+def _run(key, warm, frames, selected_year, data_version):
+    df, df_raw, df_attrition = frames
+    try:
+        warm(df, df_raw, selected_year, data_version=data_version, df_attrition=df_attrition)
+    except Exception:
+        # Forget failed prefetches; the tab computes (and reports) on its own
+        with _scheduled_lock:
+            _scheduled.pop(key, None)
+
+
+def wait_idle():
+    """Block until every queued prefetch has finished"""
+    with _scheduled_lock:
+        futures = list(_scheduled.values())
+    wait(futures)
+
+
+def reset():
+    """Wait for queued prefetches, then forget them so they run again"""
+    wait_idle()
+    with _scheduled_lock:
+        _scheduled.clear()
+
+
+def schedule_prefetch(prefetchers, active_tab, data_version, selected_year, load_frames):
+    """Queue each inactive tab's prefetch once per (tab, data version, year).
+
+    prefetchers maps tab index -> prefetch(df, df_raw, selected_year,
+    data_version=..., df_attrition=...). load_frames is only called when
+    something is queued and returns the shared (df, df_raw, df_attrition), so
+    cache keys match the ones render() will use.
+    """
+    with _scheduled_lock:
+        pending = [
+            (tab, warm) for tab, warm in prefetchers.items()
+            if tab != active_tab and (tab, data_version, str(selected_year)) not in _scheduled
+        ]
+        if not pending:
+            return
+
+        # Results for older data versions are never read again
+        for key in [key for key in _scheduled if key[1] != data_version]:
+            del _scheduled[key]
+
+        frames = load_frames()
+        for tab, warm in pending:
+            key = (tab, data_version, str(selected_year))
+            _scheduled[key] = _executor.submit(_run, key, warm, frames, selected_year, data_version)
@@ -0,0 +1,94 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+
+import streamlit as st
+
+# -----------------------------
+# On-demand profiling: ?profile=1 runs this session's reruns under cProfile
+# and saves each one as a .prof file (pstats format: snakeviz, flameprof and
+# gprof2dot all read it) with a JSON sidecar describing the view.
+# Before Python 3.12 cProfile only records the thread that enabled it, so
+# other sessions' script threads are left out. From 3.12 it is built on
+# sys.monitoring, which is process-wide: a profile also counts whatever other
+# sessions and the prefetch threads ran meanwhile, and only one profiler can
+# be active at a time (a second session asking for one is told to retry).
+# -----------------------------
+PROFILE_PARAM = "profile"
+PROFILE_DIR = "profiles"
+
+# Widget state saved with each profile so a slow view can be reproduced
+CONTEXT_KEYS = [
+    "active_tab", "selected_year", "resigned_month_dropdown", "retention_view_dropdown",
+    "attrition_month_dropdown", "risk_segment_dropdown",
+]
+
+
+def profiling_enabled():
+    return st.query_params.get(PROFILE_PARAM) in ("1", "true")
+
+
+def start_profile():
+    """Start profiling this rerun if ?profile=1 is set; returns the profiler or None"""
+    # A rerun interrupted by st.rerun() never reached finish_profile()
+    leftover = st.session_state.pop("_profiler", None)
+    if leftover is not None:
+        leftover.disable()
+
+    if not profiling_enabled():
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+: another session's profiler is running
+        st.caption("🔬 Another session is being profiled; rerun to profile this one.")
+        return None
+    st.session_state["_profiler"] = profiler
+    return profiler
+
+
+def view_context():
+    """Tab, year and widget selections of the current rerun"""
+    context = {key: st.session_state.get(key) for key in CONTEXT_KEYS if key in st.session_state}
+    context["query_params"] = st.query_params.to_dict()
+    return context
+
+
+def save_profile(profiler, context):
+    """Write the profile and its context; returns the .prof path"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    name = f"{stamp}_tab{context.get('active_tab')}_{context.get('selected_year')}"
+    path = os.path.join(PROFILE_DIR, f"{name}.prof")
+
+    profiler.dump_stats(path)
+    with open(os.path.join(PROFILE_DIR, f"{name}.json"), "w") as f:
+        json.dump(dict(context, created=stamp), f, indent=2, default=str)
+    return path
+
+
+def finish_profile(profiler, top=25):
+    """Stop profiling, save the result and offer it for download"""
+    if profiler is None:
+        return
+    profiler.disable()
+    st.session_state.pop("_profiler", None)
+
+    context = view_context()
+    path = save_profile(profiler, context)
+
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).strip_dirs().sort_stats("cumulative").print_stats(top)
+
+    with st.expander("🔬 Rerun profile (profile mode)", expanded=True):
+        st.caption(f"Saved to {path} for {json.dumps(context, default=str)}")
+        with open(path, "rb") as f:
+            st.download_button(
+                "Download profile (.prof)", f.read(),
+                file_name=os.path.basename(path), mime="application/octet-stream"
+            )
+        st.code(summary.getvalue(), language="text")
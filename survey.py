@@ -1,9 +1,31 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from sklearn.preprocessing import LabelEncoder
+from figure_cache import cached_figure
+from metric_cards import metric_row
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedGroupKFold
 import numpy as np
+import os
+from cache_utils import array_fingerprint
+from feature_store import get_category_levels, get_feature_matrix
+from panel import freeze, PANEL_HASH_FUNCS
+from timing import section, timed, mark_cache_miss
+from bounded_cache import bounded_cache
+from driver_analysis import (
+    importance_intervals, error_bars, N_BOOTSTRAP, CI_LEVEL, MODEL_JOBS,
+    RESIGNATION_FEATURES, PROMOTION_FEATURES, TARGET_FEATURES, PRECOMPUTED_DRIVERS_FILE, PRECOMPUTED_SHEETS,
+    encode_features, score_risk, driver_correlations,
+    refresh_driver_model, importance_table, precomputed_importances
+)
+
+# Survey workbooks read by this tab
+SURVEY_FILES = {"engagement": "Emp Engagement.xlsx", "participation": "Participation.xlsx"}
+
+def ci_caption(bounds):
+    if bounds is None:
+        return "Confidence intervals are being computed in the background and will appear on the next refresh."
+    return f"Error bars show {CI_LEVEL:.0%} bootstrap intervals over {N_BOOTSTRAP} resamples."
 
 def render(df, df_raw, selected_year):
     # -----------------------------
@@ -36,19 +58,7 @@ def render(df, df_raw, selected_year):
     # -----------------------------
     # Load survey datasets
     # -----------------------------
-    df_engagement = pd.read_excel("Emp Engagement.xlsx", sheet_name="Sheet1")
-    df_participation = pd.read_excel("Participation.xlsx", sheet_name="Sheet1")
-
-    # Clean up column names
-    df_engagement.columns = df_engagement.columns.str.strip()
-    df_participation.columns = df_participation.columns.str.strip()
-
-    # Normalize Calendar Year
-    df_engagement["Calendar Year"] = pd.to_datetime(df_engagement["Calendar Year"], errors="coerce")
-    df_engagement["Year"] = df_engagement["Calendar Year"].dt.year
-
-    df_participation["Calendar Year"] = pd.to_datetime(df_participation["Calendar Year"], errors="coerce")
-    df_participation["Year"] = df_participation["Calendar Year"].dt.year
+    df_engagement, df_participation = load_survey_data()
 
     # -----------------------------
     # Filter by selected year
@@ -81,17 +91,10 @@ def render(df, df_raw, selected_year):
     # -----------------------------
     # Top metrics row (5 metrics)
     # -----------------------------
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Average Engagement Score</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{avg_engagement_score:.1f}%</div>", unsafe_allow_html=True)
-    
-    with col2:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Survey Participation Rate</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{participation_rate:.1f}%</div>", unsafe_allow_html=True)
+    metric_row([
+        ("Average Engagement Score", f"{avg_engagement_score:.1f}%"),
+        ("Survey Participation Rate", f"{participation_rate:.1f}%"),
+    ])
 
     st.markdown("<style>h2 { margin-bottom: -0.5rem !important; } </style>", unsafe_allow_html=True)
 
@@ -119,41 +122,44 @@ def render(df, df_raw, selected_year):
     with st.container(border=True):
         st.markdown(f"#### Engagement Ratings Breakdown")
 
-        # Updated color palette: Outstanding=Green, Average=Gray, Needs Improvement=Red
-        rating_colors = {
-            "Outstanding": "#2E8B57",      # Green
-            "Average": "#808080",          # Gray
-            "Needs Improvement": "#B22222" # Red
-        }
-
-        # Define rating order
-        rating_order = ["Outstanding", "Average", "Needs Improvement"]
-
-        fig_stacked = go.Figure()
-
-        for rating in rating_order:
-            fig_stacked.add_trace(go.Bar(
-                y=pivot_df.index,
-                x=pivot_df[rating],
-                name=rating,
-                orientation="h",
-                marker_color=rating_colors[rating],
-                text=pivot_df[rating].round(0).astype(str) + "%",
-                textposition="inside"
-            ))
-
-        row_count = len(pivot_df.index)
-        chart_height = max(300, 40 * row_count)
-
-        fig_stacked.update_layout(
-            barmode="stack",
-            xaxis={"title": "Percentage", "ticksuffix": "%"},
-            yaxis={"title": "Dimensions", "automargin": True},
-            height=chart_height,
-            margin={"l": 20, "r": 100, "t": 20, "b": 80},
-            legend_title="Rating Type"
-        )
+        def build_engagement_chart():
+            # Updated color palette: Outstanding=Green, Average=Gray, Needs Improvement=Red
+            rating_colors = {
+                "Outstanding": "#2E8B57",      # Green
+                "Average": "#808080",          # Gray
+                "Needs Improvement": "#B22222" # Red
+            }
 
+            # Define rating order
+            rating_order = ["Outstanding", "Average", "Needs Improvement"]
+
+            fig_stacked = go.Figure()
+
+            for rating in rating_order:
+                fig_stacked.add_trace(go.Bar(
+                    y=pivot_df.index,
+                    x=pivot_df[rating],
+                    name=rating,
+                    orientation="h",
+                    marker_color=rating_colors[rating],
+                    text=pivot_df[rating].round(0).astype(str) + "%",
+                    textposition="inside"
+                ))
+
+            row_count = len(pivot_df.index)
+            chart_height = max(300, 40 * row_count)
+
+            fig_stacked.update_layout(
+                barmode="stack",
+                xaxis={"title": "Percentage", "ticksuffix": "%"},
+                yaxis={"title": "Dimensions", "automargin": True},
+                height=chart_height,
+                margin={"l": 20, "r": 100, "t": 20, "b": 80},
+                legend_title="Rating Type"
+            )
+            return fig_stacked
+
+        fig_stacked = cached_figure("engagement_breakdown", (selected_year,), build_engagement_chart)
         st.plotly_chart(fig_stacked, use_container_width=True)
 
     # -----------------------------
@@ -161,6 +167,8 @@ def render(df, df_raw, selected_year):
     # -----------------------------
     with st.container(border=True):
         st.markdown("#### Driver Analysis")
+
+        precomputed = load_precomputed_drivers(PRECOMPUTED_DRIVERS_FILE)
         
         # Create two columns for resignation and promotion analysis
         analysis_col1, analysis_col2 = st.columns(2)
@@ -171,90 +179,73 @@ def render(df, df_raw, selected_year):
         with analysis_col1:
             st.markdown("##### By Resignation")
             
-            # Prepare data
-            df_analysis = df_raw.copy()
+            # Prepare encoded features and the Resigned target
+            features = RESIGNATION_FEATURES
+            X, y = get_feature_matrix(df_raw, selected_year, "resignation")
+            resign_fingerprint = array_fingerprint(X, y)
 
-            # Add year filtering
-            if selected_year != "All":
-                df_analysis = df_analysis[df_analysis["Year"] == int(selected_year)]
-            
-            # Create binary resignation flag
-            df_analysis["Resigned"] = df_analysis["Resignee Checking"].apply(
-                lambda x: 0 if str(x).strip().upper() == "ACTIVE" else 1
-            )
-            
-            # Select features for analysis
-            features = ["Tenure", "Position/Level", "Generation", "Gender", "Promotion & Transfer"]
-            
-            # Encode categorical variables
-            le = LabelEncoder()
-            df_encoded = df_analysis[features + ["Resigned"]].copy()
-            
-            for col in ["Position/Level", "Generation", "Gender"]:
-                if col in df_encoded.columns:
-                    df_encoded[col] = le.fit_transform(df_encoded[col].astype(str))
-            
-            # Remove NaN values
-            df_encoded = df_encoded.dropna()
-            
-            X = df_encoded[features]
-            y = df_encoded["Resigned"]
-            
-            # Train Random Forest to get feature importance
-            rf = RandomForestClassifier(n_estimators=100, random_state=42)
-            rf.fit(X, y)
-            
-            # Get feature importance
-            importance_df = pd.DataFrame({
-                "Driver": features,
-                "Importance": rf.feature_importances_
-            }).sort_values("Importance", ascending=False)
-            
-            importance_df["Importance %"] = (importance_df["Importance"] * 100).round(1)
+            # Use precomputed importances when they match this data, otherwise train live
+            importance_df = precomputed_importances(precomputed["resignation"], selected_year, resign_fingerprint, features)
+            if importance_df is None:
+                with section("driver_model:resignation", rows=len(y), cached=True):
+                    rf = refresh_driver_model("resignation", selected_year, X, y, resign_fingerprint)
+                importance_df = importance_table(rf, features)
+
+            # Bootstrap confidence intervals (computed in the background, cached per year)
+            resign_bounds = importance_intervals("resignation", selected_year, resign_fingerprint, X, y)
             
             # Display metrics with year
-            st.markdown(f"<div class='metric-label'>Top Driver: {importance_df.iloc[0]['Driver']}</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{importance_df.iloc[0]['Importance %']}%</div>", unsafe_allow_html=True)
-            
-            # Driver Importance Chart
-            fig = go.Figure(data=go.Bar(
-                x=importance_df["Importance %"],
-                y=importance_df["Driver"],
-                orientation="h",
-                marker_color="#00008B",
-                text=importance_df["Importance %"].apply(lambda x: f"{x}%"),
-                textposition="outside"
-            ))
-            
-            fig.update_layout(
-                height=300,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                xaxis={"title": "Importance (%)"},
-                yaxis={"title": "Driver"},
-                showlegend=False
-            )
-            
+            metric_row([(f"Top Driver: {importance_df.iloc[0]['Driver']}", f"{importance_df.iloc[0]['Importance %']}%")], bordered=False)
+            
+            def build_resignation_importance_chart():
+                # Driver Importance Chart
+                fig = go.Figure(data=go.Bar(
+                    x=importance_df["Importance %"],
+                    y=importance_df["Driver"],
+                    orientation="h",
+                    marker_color="#00008B",
+                    error_x=error_bars(importance_df, resign_bounds),
+                    text=importance_df["Importance %"].apply(lambda x: f"{x}%"),
+                    textposition="outside"
+                ))
+            
+                fig.update_layout(
+                    height=300,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    xaxis={"title": "Importance (%)"},
+                    yaxis={"title": "Driver"},
+                    showlegend=False
+                )
+            
+                return fig
+
+            fig = cached_figure("resignation_importance", (selected_year, resign_fingerprint, resign_bounds is not None), build_resignation_importance_chart)
             st.plotly_chart(fig, use_container_width=True)
+            st.caption(ci_caption(resign_bounds))
             
             # Correlation Chart
-            corr_matrix = df_encoded[features + ["Resigned"]].corr()["Resigned"].drop("Resigned").sort_values(ascending=False)
-            
-            fig_corr = go.Figure(data=go.Bar(
-                x=corr_matrix.values,
-                y=corr_matrix.index,
-                orientation="h",
-                marker_color=["#00008B" if x > 0 else "#B22222" for x in corr_matrix.values],
-                text=[f"{x:.3f}" for x in corr_matrix.values],
-                textposition="outside"
-            ))
-            
-            fig_corr.update_layout(
-                height=300,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                xaxis={"title": "Correlation Coefficient"},
-                yaxis={"title": "Driver"}
-            )
-            
+            def build_resignation_corr_chart():
+                corr_matrix = driver_correlations(X, y, features, "Resigned")
+            
+                fig_corr = go.Figure(data=go.Bar(
+                    x=corr_matrix.values,
+                    y=corr_matrix.index,
+                    orientation="h",
+                    marker_color=["#00008B" if x > 0 else "#B22222" for x in corr_matrix.values],
+                    text=[f"{x:.3f}" for x in corr_matrix.values],
+                    textposition="outside"
+                ))
+            
+                fig_corr.update_layout(
+                    height=300,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    xaxis={"title": "Correlation Coefficient"},
+                    yaxis={"title": "Driver"}
+                )
+            
+                return fig_corr
+
+            fig_corr = cached_figure("resignation_correlation", (selected_year, resign_fingerprint), build_resignation_corr_chart)
             st.plotly_chart(fig_corr, use_container_width=True)
 
         # -----------------------------
@@ -263,122 +254,232 @@ def render(df, df_raw, selected_year):
         with analysis_col2:
             st.markdown("##### By Promotion")
             
-            # Prepare data for promotion analysis
-            df_promo = df_raw[df_raw["Resignee Checking"].str.strip().str.upper() == "ACTIVE"].copy()
+            # Prepare encoded features and the Promoted target
+            promo_features = PROMOTION_FEATURES
+            X_promo, y_promo = get_feature_matrix(df_raw, selected_year, "promotion")
+            promo_fingerprint = array_fingerprint(X_promo, y_promo)
 
-            # Add year filtering
-            if selected_year != "All":
-                df_promo = df_promo[df_promo["Year"] == int(selected_year)]
-            
-            # Create binary promotion flag
-            def to_promo_flag(x):
-                s = str(x).strip().upper()
-                if s in {"1", "YES", "TRUE"}:
-                    return 1
-                return 0
-            
-            df_promo["Promoted"] = df_promo["Promotion & Transfer"].apply(to_promo_flag)
-            
-            # Select features for promotion analysis
-            promo_features = ["Tenure", "Position/Level", "Generation", "Gender"]
-            
-            # Encode categorical variables
-            le_promo = LabelEncoder()
-            df_promo_encoded = df_promo[promo_features + ["Promoted"]].copy()
-            
-            for col in ["Position/Level", "Generation", "Gender"]:
-                if col in df_promo_encoded.columns:
-                    df_promo_encoded[col] = le_promo.fit_transform(df_promo_encoded[col].astype(str))
-            
-            # Remove NaN values
-            df_promo_encoded = df_promo_encoded.dropna()
-            
-            X_promo = df_promo_encoded[promo_features]
-            y_promo = df_promo_encoded["Promoted"]
-            
-            # Train Random Forest to get feature importance
-            rf_promo = RandomForestClassifier(n_estimators=100, random_state=42)
-            rf_promo.fit(X_promo, y_promo)
-            
-            # Get feature importance
-            importance_promo_df = pd.DataFrame({
-                "Driver": promo_features,
-                "Importance": rf_promo.feature_importances_
-            }).sort_values("Importance", ascending=False)
-            
-            importance_promo_df["Importance %"] = (importance_promo_df["Importance"] * 100).round(1)
+            # Use precomputed importances when they match this data, otherwise train live
+            importance_promo_df = precomputed_importances(precomputed["promotion"], selected_year, promo_fingerprint, promo_features)
+            if importance_promo_df is None:
+                with section("driver_model:promotion", rows=len(y_promo), cached=True):
+                    rf_promo = refresh_driver_model("promotion", selected_year, X_promo, y_promo, promo_fingerprint)
+                importance_promo_df = importance_table(rf_promo, promo_features)
+
+            # Bootstrap confidence intervals (computed in the background, cached per year)
+            promo_bounds = importance_intervals("promotion", selected_year, promo_fingerprint, X_promo, y_promo)
             
             # Display metrics with year
-            st.markdown(f"<div class='metric-label'>Top Driver: {importance_promo_df.iloc[0]['Driver']}</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{importance_promo_df.iloc[0]['Importance %']}%</div>", unsafe_allow_html=True)
-            
-            # Driver Importance Chart
-            fig_promo = go.Figure(data=go.Bar(
-                x=importance_promo_df["Importance %"],
-                y=importance_promo_df["Driver"],
-                orientation="h",
-                marker_color="#2E8B57",
-                text=importance_promo_df["Importance %"].apply(lambda x: f"{x}%"),
-                textposition="outside"
-            ))
-            
-            fig_promo.update_layout(
-                height=300,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                xaxis={"title": "Importance (%)"},
-                yaxis={"title": "Driver"},
-                showlegend=False
-            )
-            
+            metric_row([(f"Top Driver: {importance_promo_df.iloc[0]['Driver']}", f"{importance_promo_df.iloc[0]['Importance %']}%")], bordered=False)
+            
+            def build_promotion_importance_chart():
+                # Driver Importance Chart
+                fig_promo = go.Figure(data=go.Bar(
+                    x=importance_promo_df["Importance %"],
+                    y=importance_promo_df["Driver"],
+                    orientation="h",
+                    marker_color="#2E8B57",
+                    error_x=error_bars(importance_promo_df, promo_bounds),
+                    text=importance_promo_df["Importance %"].apply(lambda x: f"{x}%"),
+                    textposition="outside"
+                ))
+            
+                fig_promo.update_layout(
+                    height=300,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    xaxis={"title": "Importance (%)"},
+                    yaxis={"title": "Driver"},
+                    showlegend=False
+                )
+            
+                return fig_promo
+
+            fig_promo = cached_figure("promotion_importance", (selected_year, promo_fingerprint, promo_bounds is not None), build_promotion_importance_chart)
             st.plotly_chart(fig_promo, use_container_width=True)
+            st.caption(ci_caption(promo_bounds))
             
             # Correlation Chart
-            corr_promo_matrix = df_promo_encoded[promo_features + ["Promoted"]].corr()["Promoted"].drop("Promoted").sort_values(ascending=False)
-            
-            fig_corr_promo = go.Figure(data=go.Bar(
-                x=corr_promo_matrix.values,
-                y=corr_promo_matrix.index,
-                orientation="h",
-                marker_color=["#2E8B57" if x > 0 else "#B22222" for x in corr_promo_matrix.values],
-                text=[f"{x:.3f}" for x in corr_promo_matrix.values],
-                textposition="outside"
-            ))
-            
-            fig_corr_promo.update_layout(
-                height=300,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                xaxis={"title": "Correlation Coefficient"},
-                yaxis={"title": "Driver"}
-            )
-            
+            def build_promotion_corr_chart():
+                corr_promo_matrix = driver_correlations(X_promo, y_promo, promo_features, "Promoted")
+            
+                fig_corr_promo = go.Figure(data=go.Bar(
+                    x=corr_promo_matrix.values,
+                    y=corr_promo_matrix.index,
+                    orientation="h",
+                    marker_color=["#2E8B57" if x > 0 else "#B22222" for x in corr_promo_matrix.values],
+                    text=[f"{x:.3f}" for x in corr_promo_matrix.values],
+                    textposition="outside"
+                ))
+            
+                fig_corr_promo.update_layout(
+                    height=300,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    xaxis={"title": "Correlation Coefficient"},
+                    yaxis={"title": "Driver"}
+                )
+            
+                return fig_corr_promo
+
+            fig_corr_promo = cached_figure("promotion_correlation", (selected_year, promo_fingerprint), build_promotion_corr_chart)
             st.plotly_chart(fig_corr_promo, use_container_width=True)
 
-@st.cache_data
+    # -----------------------------
+    # Attrition Risk - active employees scored out-of-fold by the resignation model
+    # -----------------------------
+    with st.container(border=True):
+        st.markdown("#### Attrition Risk")
+        st.caption(f"Out-of-fold estimates: each employee is scored by a model trained without any of their records ({RISK_FOLDS} folds).")
+
+        risk_df = get_risk_scores(df_raw, selected_year)
+
+        if risk_df.empty:
+            st.info("No active employees to score for the selected year.")
+        else:
+            risk_col1, risk_col2 = st.columns(2)
+
+            with risk_col1:
+                st.markdown("##### At-Risk Employees")
+                st.dataframe(
+                    risk_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    height=300,
+                    column_config={
+                        "Risk %": st.column_config.ProgressColumn("Risk %", format="%.1f%%", min_value=0, max_value=100)
+                    }
+                )
+
+            with risk_col2:
+                st.markdown("##### Average Risk by Segment")
+                risk_by = st.selectbox("Segment By", ["Position/Level", "Generation"], key="risk_segment_dropdown")
+                def build_risk_chart():
+                    risk_summary = risk_df.groupby(risk_by)["Risk %"].mean().round(1).sort_values()
+
+                    fig_risk = go.Figure(data=go.Bar(
+                        x=risk_summary.values,
+                        y=risk_summary.index,
+                        orientation="h",
+                        marker_color="#B22222",
+                        text=[f"{x}%" for x in risk_summary.values],
+                        textposition="outside"
+                    ))
+
+                    fig_risk.update_layout(
+                        height=250,
+                        margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                        xaxis={"title": "Average Risk (%)"},
+                        yaxis={"title": risk_by},
+                        showlegend=False
+                    )
+                    return fig_risk
+
+                fig_risk = cached_figure("risk_by_segment", (selected_year, risk_by), build_risk_chart)
+                st.plotly_chart(fig_risk, use_container_width=True)
+
+# Keyed on modification time: keep only the current and previous file version
+@st.cache_data(max_entries=2)
+def _read_precomputed_drivers(path, mtime):
+    mark_cache_miss()
+    sheets = pd.read_excel(path, sheet_name=list(PRECOMPUTED_SHEETS.values()))
+    return {target: sheets[sheet] for target, sheet in PRECOMPUTED_SHEETS.items()}
+
+
+def load_precomputed_drivers(path):
+    """Load driver importances written by build_drivers.py (None per target if unavailable)"""
+    empty = {target: None for target in PRECOMPUTED_SHEETS}
+    if not os.path.exists(path):
+        return empty
+    try:
+        # Keyed on modification time so a rebuilt file is picked up
+        with section("load_precomputed_drivers", cached=True):
+            return _read_precomputed_drivers(path, os.path.getmtime(path))
+    except Exception:
+        return empty
+
+
+# Folds for the out-of-fold risk scores
+RISK_FOLDS = 5
+
+
+@timed("train_resignation_model", cached=True)
+@bounded_cache("models", hash_funcs=PANEL_HASH_FUNCS)
 def train_resignation_model(df_raw):
-    df_analysis = df_raw.copy()
-    df_analysis["Resigned"] = df_analysis["Resignee Checking"].apply(
-        lambda x: 0 if str(x).strip().upper() == "ACTIVE" else 1
-    )
-    
-    features = ["Tenure", "Position/Level", "Generation", "Gender", "Promotion & Transfer"]
-    le = LabelEncoder()
-    df_encoded = df_analysis[features + ["Resigned"]].copy()
-    
-    for col in ["Position/Level", "Generation", "Gender"]:
-        if col in df_encoded.columns:
-            df_encoded[col] = le.fit_transform(df_encoded[col].astype(str))
-    
-    df_encoded = df_encoded.dropna()
-    X = df_encoded[features]
-    y = df_encoded["Resigned"]
-    
-    rf = RandomForestClassifier(n_estimators=100, random_state=42)
-    rf.fit(X, y)
-    
-    importance_df = pd.DataFrame({
-        "Driver": features,
-        "Importance": rf.feature_importances_
-    }).sort_values("Importance", ascending=False)
-    
-    importance_df["Importance %"] = (importance_df["Importance"] * 100).round(1)
-    return importance_df, df_encoded[features + ["Resigned"]]
+    """Out-of-fold resignation probability for every panel row; shared across sessions.
+
+    Each row is scored by a forest that never saw that employee (folds are
+    grouped by Full Name), so a current employee's risk is not the model's
+    fitted value for a row it was trained on. Rows with missing features
+    are NaN.
+    """
+    mark_cache_miss()
+    X = encode_features(df_raw, RESIGNATION_FEATURES, get_category_levels(df_raw))
+    y = (df_raw["Resignee Checking"].astype(str).str.strip().str.upper() != "ACTIVE").to_numpy(dtype=np.int8)
+    groups = df_raw["Full Name"].astype(str).to_numpy()
+    complete = np.flatnonzero(~np.isnan(X).any(axis=1))
+
+    risk = np.full(len(df_raw), np.nan, dtype=np.float32)
+    folds = StratifiedGroupKFold(n_splits=RISK_FOLDS, shuffle=True, random_state=42)
+    for train, test in folds.split(X[complete], y[complete], groups[complete]):
+        rf = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=MODEL_JOBS)
+        rf.fit(X[complete[train]], y[complete[train]])
+        risk[complete[test]] = score_risk(rf, X[complete[test]])
+    return pd.Series(risk, index=df_raw.index)
+
+
+@timed("get_risk_scores", cached=True)
+@bounded_cache("aggregates", hash_funcs=PANEL_HASH_FUNCS)
+def get_risk_scores(df_raw, selected_year):
+    """Out-of-fold resignation risk of every active employee in the selected panel year"""
+    mark_cache_miss()
+    risk = train_resignation_model(df_raw)
+
+    # "All" scores the most recent panel year
+    year = int(df_raw["Year"].max()) if selected_year == "All" else int(selected_year)
+    active = df_raw["Resignee Checking"].astype(str).str.strip().str.upper() == "ACTIVE"
+    panel_risk = risk[(df_raw["Year"] == year) & active].dropna()
+
+    scores = df_raw.loc[panel_risk.index, ["Full Name", "Position/Level", "Generation", "Gender", "Tenure"]]
+    scores = scores.assign(**{"Risk %": (panel_risk.astype(float) * 100).round(1)})
+    return freeze(scores.sort_values("Risk %", ascending=False).reset_index(drop=True))
+
+
+# Keyed on modification time: keep only the current and previous file version
+@st.cache_data(max_entries=2)
+def _read_survey_data(engagement_mtime, participation_mtime):
+    mark_cache_miss()
+    df_engagement = pd.read_excel(SURVEY_FILES["engagement"], sheet_name="Sheet1")
+    df_participation = pd.read_excel(SURVEY_FILES["participation"], sheet_name="Sheet1")
+
+    # Clean up column names
+    df_engagement.columns = df_engagement.columns.str.strip()
+    df_participation.columns = df_participation.columns.str.strip()
+
+    # Normalize Calendar Year
+    df_engagement["Calendar Year"] = pd.to_datetime(df_engagement["Calendar Year"], errors="coerce")
+    df_engagement["Year"] = df_engagement["Calendar Year"].dt.year
+
+    df_participation["Calendar Year"] = pd.to_datetime(df_participation["Calendar Year"], errors="coerce")
+    df_participation["Year"] = df_participation["Calendar Year"].dt.year
+    return df_engagement, df_participation
+
+
+def load_survey_data():
+    """Engagement and participation sheets (keyed on modification time)"""
+    with section("load_survey_data", cached=True):
+        return _read_survey_data(*(os.path.getmtime(path) for path in SURVEY_FILES.values()))
+
+
+def prefetch(df, df_raw, selected_year, data_version=None, df_attrition=None):
+    """Warm the caches render() reads (run off the request path by prefetch.py)"""
+    load_survey_data()
+    precomputed = load_precomputed_drivers(PRECOMPUTED_DRIVERS_FILE)
+
+    for target, features in TARGET_FEATURES.items():
+        X, y = get_feature_matrix(df_raw, selected_year, target)
+        fingerprint = array_fingerprint(X, y)
+        if precomputed_importances(precomputed[target], selected_year, fingerprint, features) is None:
+            refresh_driver_model(target, selected_year, X, y, fingerprint)
+        importance_intervals(target, selected_year, fingerprint, X, y)
+
+    get_risk_scores(df_raw, selected_year)
+
@@ -0,0 +1,182 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from metrics import observe_rerun, observe_section
+from cache_stats import (
+    CACHE_METRICS_FILE, call_key, namespace_usage, record_call, register_cache, snapshot, write_metrics
+)
+
+# -----------------------------
+# Per-section timing: wall time, rows processed and cache hit/miss for each
+# section of a rerun, shown in the ?debug=1 panel. Sections of ?debug=1
+# sessions (or of every session with DASHBOARD_TIMING_LOG=1) are also
+# appended to a JSONL log, rotated to TIMING_LOG.1 at TIMING_LOG_MAX_BYTES.
+# -----------------------------
+TIMING_LOG = "render_timings.jsonl"
+TIMING_LOG_MAX_BYTES = 20 * 2**20
+LOG_ALL = os.environ.get("DASHBOARD_TIMING_LOG") == "1"
+DEBUG_PARAM = "debug"
+
+# Open sections of the current script thread (innermost last)
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _session_records():
+    """This session's records for the current rerun, or None outside a script run"""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.setdefault("_timings", [])
+
+
+def begin_run():
+    """Start a new rerun's timing records (called at the top of the app)"""
+    if _session_records() is not None:
+        st.session_state["_timings"] = []
+    _stack().clear()
+    _local.run_started = time.perf_counter()
+
+
+def end_run(tab):
+    """Record the finished rerun's latency for the metrics export (called at
+    the end of the app; reruns cut short by st.rerun() are not counted)"""
+    started = getattr(_local, "run_started", None)
+    if started is not None:
+        observe_rerun(tab, time.perf_counter() - started)
+        _local.run_started = None
+
+
+def mark_cache_miss():
+    """Flag the innermost cached section as a miss (call from a cached function body)"""
+    for record in reversed(_stack()):
+        if record["cache"] is not None:
+            record["cache"] = "miss"
+            return
+
+
+def _write_log(record):
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if not LOG_ALL and (ctx is None or not debug_enabled()):
+        return
+    line = dict(record, ts=round(time.time(), 3), session=ctx.session_id[:8] if ctx else None)
+    if ctx is not None:
+        line["tab"] = st.session_state.get("active_tab")
+        line["year"] = str(st.session_state.get("selected_year"))
+    with _log_lock:
+        if os.path.exists(TIMING_LOG) and os.path.getsize(TIMING_LOG) > TIMING_LOG_MAX_BYTES:
+            os.replace(TIMING_LOG, f"{TIMING_LOG}.1")
+        with open(TIMING_LOG, "a") as f:
+            f.write(json.dumps(line) + "\n")
+
+
+@contextmanager
+def section(name, rows=None, cached=False):
+    """Time a block of a rerun; yields the record so the block can set "rows".
+
+    cached=True starts the section as a cache hit; mark_cache_miss() inside
+    the cached function's body turns it into a miss. Cached sections are also
+    counted in cache_stats; the block may set record["key"] (the cache key)
+    and record["value"] (the cached value) so entries and bytes are tracked.
+    """
+    stack = _stack()
+    record = {"section": name, "depth": len(stack), "ms": None, "rows": rows, "cache": "hit" if cached else None}
+    stack.append(record)
+    # Listed when opened so the debug table reads in execution order
+    records = _session_records()
+    if records is not None:
+        records.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        stack.pop()
+        key, value = record.pop("key", None), record.pop("value", None)
+        if record["cache"] is not None:
+            record_call(name, record["cache"] == "hit", record["ms"], key, value)
+        observe_section(name, record["ms"], record["cache"])
+        try:
+            _write_log(record)
+        except OSError:
+            pass
+
+
+def timed(name, cached=False):
+    """Decorator form of section(); rows come from the first DataFrame argument"""
+    def decorator(func):
+        if cached:
+            # Limit of the st.cache_* function underneath, or the budgeted
+            # cache's own entry/byte counts
+            register_cache(
+                name, getattr(getattr(func, "_info", None), "max_entries", None), getattr(func, "cache_sizes", None)
+            )
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows = next((len(a) for a in args if isinstance(a, pd.DataFrame)), None)
+            with section(name, rows=rows, cached=cached) as record:
+                result = func(*args, **kwargs)
+                if cached:
+                    record["key"], record["value"] = call_key(args, kwargs), result
+                return result
+        return wrapper
+    return decorator
+
+
+def debug_enabled():
+    return st.query_params.get(DEBUG_PARAM) in ("1", "true")
+
+
+def render_debug_panel():
+    """Timing table for this rerun and process-wide cache accounting (only with ?debug=1 in the URL)"""
+    if not debug_enabled():
+        return
+    records = _session_records() or []
+    with st.expander("⏱️ Render timings (debug)", expanded=True):
+        if records:
+            table = pd.DataFrame(records)
+            table["section"] = ["· " * depth + name for depth, name in zip(table["depth"], table["section"])]
+            total = table.loc[table["depth"] == 0, "ms"].sum()
+            st.caption(f"Top-level sections: {total:.0f} ms. Appended to {TIMING_LOG} (rotated at {TIMING_LOG_MAX_BYTES // 2**20} MiB).")
+            st.dataframe(table[["section", "ms", "rows", "cache"]], use_container_width=True, hide_index=True)
+        else:
+            st.caption("No timings recorded for this rerun.")
+
+    with st.expander("🗄️ Cache accounting (debug, all sessions)", expanded=True):
+        caches = snapshot()
+        if not caches:
+            st.caption("No cached sections have run yet.")
+            return
+        write_metrics(force=True)
+        table = pd.DataFrame(caches).sort_values("saved_ms", ascending=False)
+        table["entries"] = table["entries"].astype("Int64")
+        table["MiB"] = (table["bytes"] / 2**20).round(2)
+        st.caption(
+            f"Since server start: {table['hits'].sum()} hits, {table['misses'].sum()} misses, "
+            f"{table['saved_ms'].sum() / 1000:.1f} s of compute saved. Written to {CACHE_METRICS_FILE}."
+        )
+        st.dataframe(table.drop(columns="bytes"), use_container_width=True, hide_index=True)
+
+        budget = pd.DataFrame(namespace_usage())
+        if not budget.empty:
+            st.caption("Budgeted cache by namespace (MiB used of quota):")
+            st.dataframe(
+                budget.assign(
+                    MiB=(budget["bytes"] / 2**20).round(2), quota_MiB=(budget["quota_bytes"] / 2**20).round(1)
+                )[["namespace", "entries", "MiB", "quota_MiB", "evictions", "rejected"]],
+                use_container_width=True, hide_index=True
+            )
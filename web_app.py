@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 
 # Import tab modules
 import workforce
@@ -7,6 +6,15 @@ import attrition_retention as attrition
 import career
 import survey
 import aboutus
+from cache_utils import source_version
+from data_loader import DATA_FILES, start_loading, is_loaded, load_data
+from metric_cards import loading_skeleton
+from prefetch import schedule_prefetch
+from assets import inject_css
+from timing import begin_run, end_run, section, mark_cache_miss, render_debug_panel
+from profiling import start_profile, finish_profile
+from metrics import serve_metrics
+from memory_profile import tab_memory_profile, render_memory_report
 
 # -----------------------------
 # Page configuration
@@ -17,33 +25,29 @@ st.set_page_config(
     page_icon="📊"
 )
 
-# -----------------------------
-# Load CSS file globally
-# -----------------------------
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# Per-section timings for this rerun (shown with ?debug=1)
+begin_run()
 
-# -----------------------------
-# Load Excel outputs with caching
-# -----------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_excel("HR_Analysis_Output.xlsx", sheet_name=None)
-    df_raw = pd.read_excel("HR Cleaned Data 01.09.26.xlsx", sheet_name="Data")
-    df_attrition = pd.read_excel("Attrition-Vol and Invol.xlsx")
-    return df, df_raw, df_attrition
+# Prometheus metrics on 127.0.0.1:$DASHBOARD_METRICS_PORT (started once per process)
+serve_metrics()
 
-# Load data once using cache
-df, df_raw, df_attrition = load_data()
+# cProfile this rerun when the URL has ?profile=1 (one profiler at a time on Python 3.12+)
+profiler = start_profile()
 
 # -----------------------------
-# Ensure Year column exists
+# Load CSS file globally (minified and cached; also styles the tab buttons)
 # -----------------------------
-if "Year" not in df_raw.columns and "Calendar Year" in df_raw.columns:
-    df_raw["Year"] = pd.to_datetime(df_raw["Calendar Year"]).dt.year
+with section("styles"):
+    inject_css("styles.css")
 
-if "Year" not in df_attrition.columns and "Calendar Year" in df_attrition.columns:
-    df_attrition["Year"] = pd.to_datetime(df_attrition["Calendar Year"]).dt.year
+# -----------------------------
+# Start loading the Excel outputs in the background; the shell below
+# renders while the workbooks are parsed
+# -----------------------------
+# Version tag of every workbook the tabs read; keys cached figures
+with section("data_version"):
+    st.session_state.data_version = source_version(*DATA_FILES)
+    data_jobs = start_loading(st.session_state.data_version)
 
 # -----------------------------
 # App Title
@@ -71,50 +75,6 @@ selected_year = st.radio(
 if "active_tab" not in st.session_state:
     st.session_state.active_tab = 0
 
-# -----------------------------
-# Custom CSS for tab buttons
-# -----------------------------
-st.markdown("""
-<style>
-    /* Style for inactive tab buttons */
-    div[data-testid="column"] > div > div > button[kind="secondary"] {
-        width: 100%;
-        border-radius: 5px;
-        border: 2px solid #e0e0e0;
-        background-color: white;
-        color: #333;
-        font-weight: 500;
-        padding: 10px;
-        transition: all 0.3s;
-    }
-    
-    /* Hover state for inactive tabs */
-    div[data-testid="column"] > div > div > button[kind="secondary"]:hover {
-        border-color: #6495ED;
-        background-color: #f0f8ff;
-        color: #00008B;
-    }
-    
-    /* Style for active tab button */
-    div[data-testid="column"] > div > div > button[kind="primary"] {
-        width: 100%;
-        border-radius: 5px;
-        border: 2px solid #00008B;
-        background-color: #00008B;
-        color: white;
-        font-weight: 600;
-        padding: 10px;
-        transition: all 0.3s;
-    }
-    
-    /* Hover state for active tab */
-    div[data-testid="column"] > div > div > button[kind="primary"]:hover {
-        background-color: #000070;
-        border-color: #000070;
-    }
-</style>
-""", unsafe_allow_html=True)
-
 # -----------------------------
 # Tab navigation with buttons (persist active tab using query params)
 # -----------------------------
@@ -150,22 +110,67 @@ st.query_params["active_tab"] = str(st.session_state.active_tab)
 
 st.markdown("---")
 
+# -----------------------------
+# Placeholder content until the workbooks are parsed
+# -----------------------------
+content = st.empty()
+with section("load_data", cached=True) as load_record:
+    if not is_loaded(data_jobs):
+        mark_cache_miss()
+        with content.container():
+            loading_skeleton(n_cards=5 if st.session_state.active_tab == 1 else 3)
+
+    df, df_raw, df_attrition = load_data(data_jobs)
+    load_record["rows"] = len(df_raw)
+    # One load per data version; sized for the cache accounting
+    load_record["key"] = st.session_state.data_version
+    load_record["value"] = (df, df_raw, df_attrition)
+
 # -----------------------------
 # Render content based on active tab
 # -----------------------------
 active_tab = st.session_state.active_tab
 
-if active_tab == 0:  # Workforce
-    workforce.render(df, df_raw, st.session_state.selected_year)
+# tracemalloc snapshots around the render with ?memprofile=1
+with content.container(), section(f"render:{tab_names[active_tab]}", rows=len(df_raw)), \
+        tab_memory_profile(tab_names[active_tab].split(" ", 1)[1]) as memory_report:
+    if active_tab == 0:  # Workforce
+        workforce.render(df, df_raw, st.session_state.selected_year)
+
+    elif active_tab == 1:  # Attrition & Retention
+        attrition.render(df, df_raw, st.session_state.selected_year, df_attrition)
+
+    elif active_tab == 2:  # Career Progression
+        career.render(df, df_raw, st.session_state.selected_year)
 
-elif active_tab == 1:  # Attrition & Retention
-    attrition.render(df, df_raw, st.session_state.selected_year, df_attrition)
+    elif active_tab == 3:  # Survey & Feedback
+        survey.render(df, df_raw, st.session_state.selected_year)
 
-elif active_tab == 2:  # Career Progression
-    career.render(df, df_raw, st.session_state.selected_year)
+    elif active_tab == 4:  # About Us
+        aboutus.render(df, df_raw, st.session_state.selected_year)
+
+# -----------------------------
+# Warm the other tabs' caches for this year in the background
+# -----------------------------
+with section("schedule_prefetch"):
+    schedule_prefetch(
+        {0: workforce.prefetch, 1: attrition.prefetch, 2: career.prefetch, 3: survey.prefetch},
+        active_tab,
+        st.session_state.data_version,
+        st.session_state.selected_year,
+        lambda: load_data(data_jobs)
+    )
 
-elif active_tab == 3:  # Survey & Feedback
-    survey.render(df, df_raw, st.session_state.selected_year)
+# -----------------------------
+# Hidden timing panel (?debug=1) and memory report (?memprofile=1)
+# -----------------------------
+render_debug_panel()
+render_memory_report(memory_report)
+
+# -----------------------------
+# Save and offer the rerun profile (?profile=1)
+# -----------------------------
+finish_profile(profiler)
 
-elif active_tab == 4:  # About Us
-    aboutus.render(df, df_raw, st.session_state.selected_year)
+# Rerun count and latency for the metrics export
+end_run(tab_names[active_tab].split(" ", 1)[1])
@@ -1,6 +1,33 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+from figure_cache import cached_figure
+from chart_utils import nice_bin_edges, histogram_counts, histogram_bar, scale_traces
+from metric_cards import metric_row
+from panel import derive_columns
+
+
+def workforce_columns(df_raw):
+    """Normalized values this tab charts (requested through panel.derive_columns)"""
+    columns = {
+        "Resignee Checking": df_raw["Resignee Checking"].str.strip().str.upper(),
+        "Generation": df_raw["Generation"].str.strip().str.title(),
+        "Position/Level": df_raw["Position/Level"].str.strip(),
+        "Gender": df_raw["Gender"].str.strip().str.capitalize(),
+        # Calendar Year as the year number, before any filtering
+        "Calendar Year": pd.to_datetime(df_raw["Calendar Year"], errors='coerce').dt.year,
+    }
+    if "Age Bucket" in df_raw.columns:
+        columns["Age Bucket"] = df_raw["Age Bucket"].str.strip().str.capitalize()
+    return columns
+
+
+def prefetch(df, df_raw, selected_year, data_version=None, df_attrition=None):
+    """Warm the normalized view render() reads (run off the request path by
+    prefetch.py); the charts are built from small per-year summaries on click"""
+    derive_columns("workforce", df_raw, workforce_columns, data_version)
+
 
 def render(df, df_raw, selected_year):
 
@@ -41,12 +68,6 @@ def render(df, df_raw, selected_year):
     # -----------------------------
     st.markdown("## 👥 Workforce Metrics")
 
-    # -----------------------------
-    # Load CSS file
-    # -----------------------------
-    with open("styles.css") as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
     # Initialize session state for cross-filtering
     if "selected_position" not in st.session_state:
         st.session_state.selected_position = None
@@ -54,8 +75,7 @@ def render(df, df_raw, selected_year):
     # -----------------------------
     # Sheets
     # -----------------------------
-    tenure = df["Tenure Analysis"]
-    tenure["YearJoined"] = tenure["YearJoined"].astype(int)
+    tenure = df["Tenure Analysis"].astype({"YearJoined": int})
     resign = df["Resignation Trends"]
     hc = df["Headcount Per Year"]
 
@@ -93,34 +113,18 @@ def render(df, df_raw, selected_year):
     # -----------------------------
     # Display summary metrics
     # -----------------------------
-    mcol1, mcol2, mcol3 = st.columns(3)
-    
-    with mcol1:
-        with st.container(border=True):
-            st.markdown(f"<div class='metric-label'>Total Headcount</div><div class='metric-value'>{total_headcount:,}</div>", unsafe_allow_html=True)
-    
-    with mcol2:
-        with st.container(border=True):
-            st.markdown(f"<div class='metric-label'>Active Employees</div><div class='metric-value'>{active_count:,}</div>", unsafe_allow_html=True)
-    
-    with mcol3:
-        with st.container(border=True):
-            st.markdown(f"<div class='metric-label'>Leavers</div><div class='metric-value'>{leaver_count:,}</div>", unsafe_allow_html=True)
+    metric_row([
+        ("Total Headcount", f"{total_headcount:,}"),
+        ("Active Employees", f"{active_count:,}"),
+        ("Leavers", f"{leaver_count:,}"),
+    ])
 
     st.markdown("<style>h2 { margin-bottom: -0.5rem !important; } </style>", unsafe_allow_html=True)
 
     # -----------------------------
-    # Normalize values for charts
+    # Normalize values for charts (shared view; df_raw itself is read-only)
     # -----------------------------
-    df_raw["Resignee Checking"] = df_raw["Resignee Checking"].str.strip().str.upper()
-    df_raw["Generation"] = df_raw["Generation"].str.strip().str.title()
-    df_raw["Position/Level"] = df_raw["Position/Level"].str.strip()
-    df_raw["Gender"] = df_raw["Gender"].str.strip().str.capitalize()
-    if "Age Bucket" in df_raw.columns:
-        df_raw["Age Bucket"] = df_raw["Age Bucket"].str.strip().str.capitalize()
-
-    # Convert Calendar Year to datetime and extract year FIRST before any filtering
-    df_raw["Calendar Year"] = pd.to_datetime(df_raw["Calendar Year"], errors='coerce').dt.year
+    df_raw = derive_columns("workforce", df_raw, workforce_columns)
 
     # Filter: Calendar Year, Active status, and valid Position/Level
     if selected_year == "All":
@@ -178,34 +182,36 @@ def render(df, df_raw, selected_year):
             else:
                 # Display metrics
                 total_by_position = headcount_summary.groupby("Position/Level")["Headcount"].sum()
-                pos_cols = st.columns(len(total_by_position))
-                for i, (pos, count) in enumerate(total_by_position.items()):
-                    pos_cols[i].markdown(f"<div class='metric-label'>{pos}</div><div class='metric-value'>{int(count)}</div>", unsafe_allow_html=True)
-
-                # Ensure consistent ordering
-                position_order = ["Associate", "Manager & Up"]
-                headcount_summary["Position/Level"] = pd.Categorical(
-                    headcount_summary["Position/Level"], 
-                    categories=position_order, 
-                    ordered=True
-                )
+                metric_row([(pos, int(count)) for pos, count in total_by_position.items()], bordered=False)
+
+                def build_position_chart():
+                    # Ensure consistent ordering
+                    position_order = ["Associate", "Manager & Up"]
+                    headcount_summary["Position/Level"] = pd.Categorical(
+                        headcount_summary["Position/Level"], 
+                        categories=position_order, 
+                        ordered=True
+                    )
                 
-                fig1 = px.bar(
-                    headcount_summary,
-                    x="Calendar Year",
-                    y="Headcount",
-                    color="Position/Level",
-                    barmode="stack",
-                    color_discrete_map={"Associate": "#6495ED", "Manager & Up": "#00008B"},
-                    category_orders={"Position/Level": position_order}
-                )
-                fig1.update_layout(
-                    height=250,
-                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                    showlegend=True,
-                    xaxis_title="Calendar Year",
-                    yaxis_title="Headcount"
-                )
+                    fig1 = px.bar(
+                        headcount_summary,
+                        x="Calendar Year",
+                        y="Headcount",
+                        color="Position/Level",
+                        barmode="stack",
+                        color_discrete_map={"Associate": "#6495ED", "Manager & Up": "#00008B"},
+                        category_orders={"Position/Level": position_order}
+                    )
+                    fig1.update_layout(
+                        height=250,
+                        margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                        showlegend=True,
+                        xaxis_title="Calendar Year",
+                        yaxis_title="Headcount"
+                    )
+                    return fig1
+
+                fig1 = cached_figure("headcount_by_position", (selected_year,), build_position_chart)
                 st.plotly_chart(fig1, use_container_width=True)
 
     with top_col2:
@@ -239,36 +245,38 @@ def render(df, df_raw, selected_year):
             else:
                 # Display metrics - total by generation across all years
                 total_by_generation = generation_summary.groupby("Generation")["Headcount"].sum()
-                gen_cols = st.columns(len(total_by_generation))
-                for i, (gen, count) in enumerate(total_by_generation.items()):
-                    gen_cols[i].markdown(f"<div class='metric-label'>{gen}</div><div class='metric-value'>{int(count)}</div>", unsafe_allow_html=True)
+                metric_row([(gen, int(count)) for gen, count in total_by_generation.items()], bordered=False)
                 
-                # Define generation order and colors
-                generation_order = ["Baby Boomer", "Gen X", "Gen Z", "Millennial"]
-                generation_colors = {
-                    "Gen Z": "#87CEEB",
-                    "Millennial": "#4169E1",
-                    "Gen X": "#1E90FF",
-                    "Baby Boomer": "#00008B",
-                    "Boomer": "#00008B"
-                }
+                def build_generation_chart():
+                    # Define generation order and colors
+                    generation_order = ["Baby Boomer", "Gen X", "Gen Z", "Millennial"]
+                    generation_colors = {
+                        "Gen Z": "#87CEEB",
+                        "Millennial": "#4169E1",
+                        "Gen X": "#1E90FF",
+                        "Baby Boomer": "#00008B",
+                        "Boomer": "#00008B"
+                    }
                 
-                generation_summary["Generation"] = pd.Categorical(
-                    generation_summary["Generation"],
-                    categories=generation_order,
-                    ordered=True
-                )
+                    generation_summary["Generation"] = pd.Categorical(
+                        generation_summary["Generation"],
+                        categories=generation_order,
+                        ordered=True
+                    )
                 
-                # Create stacked bar chart by year
-                fig2 = px.bar(generation_summary, x="Calendar Year", y="Headcount",
-                              color="Generation", barmode="stack",
-                              color_discrete_map=generation_colors,
-                              category_orders={"Generation": generation_order})
-                fig2.update_layout(
-                    height=250,
-                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                    showlegend=True
-                )
+                    # Create stacked bar chart by year
+                    fig2 = px.bar(generation_summary, x="Calendar Year", y="Headcount",
+                                  color="Generation", barmode="stack",
+                                  color_discrete_map=generation_colors,
+                                  category_orders={"Generation": generation_order})
+                    fig2.update_layout(
+                        height=250,
+                        margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                        showlegend=True
+                    )
+                    return fig2
+
+                fig2 = cached_figure("headcount_by_generation", (selected_year,), build_generation_chart)
                 st.plotly_chart(fig2, use_container_width=True)
 
     # -----------------------------
@@ -301,46 +309,64 @@ def render(df, df_raw, selected_year):
                 avg_age = round(age_year["Age"].mean(), 1) if not age_year.empty else 0
                 median_age = float(age_year["Age"].median()) if not age_year.empty else 0
 
-            a1, a2 = st.columns(2)
-            a1.markdown(f"<div class='metric-label'>Average Age</div><div class='metric-value'>{avg_age}</div>", unsafe_allow_html=True)
-            a2.markdown(f"<div class='metric-label'>Median Age</div><div class='metric-value'>{median_age}</div>", unsafe_allow_html=True)
+            metric_row([("Average Age", avg_age), ("Median Age", median_age)], bordered=False)
 
-            # Define generation order (alphabetical)
-            generation_order = ["Baby Boomer", "Gen X", "Gen Z", "Millennial"]
+            def build_age_chart():
+                # Define generation order (alphabetical)
+                generation_order = ["Baby Boomer", "Gen X", "Gen Z", "Millennial"]
             
-            # Standardized generation colors - unique blue shades (normalize for matching)
-            if "Generation" in age_year.columns:
-                age_year["Generation"] = age_year["Generation"].str.strip().str.title()
-                # Convert to categorical with defined order
-                age_year["Generation"] = pd.Categorical(age_year["Generation"], categories=generation_order, ordered=True)
+                # Standardized generation colors - unique blue shades (normalize for matching)
+                if "Generation" in age_year.columns:
+                    age_year["Generation"] = age_year["Generation"].str.strip().str.title()
+                    # Convert to categorical with defined order
+                    age_year["Generation"] = pd.Categorical(age_year["Generation"], categories=generation_order, ordered=True)
             
-            generation_colors = {
-                "Gen Z": "#87CEEB",           # Sky Blue
-                "Millennial": "#4169E1",      # Royal Blue
-                "Gen X": "#1E90FF",           # Dodger Blue
-                "Baby Boomer": "#00008B",     # Dark Blue
-                "Boomer": "#00008B"           # Dark Blue (fallback)
-            }
+                generation_colors = {
+                    "Gen Z": "#87CEEB",           # Sky Blue
+                    "Millennial": "#4169E1",      # Royal Blue
+                    "Gen X": "#1E90FF",           # Dodger Blue
+                    "Baby Boomer": "#00008B",     # Dark Blue
+                    "Boomer": "#00008B"           # Dark Blue (fallback)
+                }
 
+                # Bin ages server-side (summing Count per bin) so only bin totals reach the browser
+                ages = age_year["Age"].to_numpy(dtype=float)
+                counts = age_year["Count"].to_numpy(dtype=float)
+                edges = nice_bin_edges(ages, nbins=25)
+
+                fig3 = go.Figure()
+                if "Generation" in age_year.columns:
+                    for gen in generation_order:
+                        in_gen = (age_year["Generation"] == gen).to_numpy()
+                        if not in_gen.any():
+                            continue
+                        fig3.add_trace(histogram_bar(
+                            edges,
+                            histogram_counts(ages[in_gen], edges, weights=counts[in_gen]),
+                            name=gen,
+                            marker_color=generation_colors[gen],
+                            width=None
+                        ))
+                    fig3.update_layout(barmode="group", legend_title="Generation")
+                else:
+                    fig3.add_trace(histogram_bar(
+                        edges,
+                        histogram_counts(ages, edges, weights=counts),
+                        marker_color="#ADD8E6"
+                    ))
+                    fig3.update_layout(bargap=0)
+                fig3.update_layout(
+                    showlegend=True,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    height=250,
+                    xaxis_title="Age",
+                    yaxis_title="Count"
+                )
+                return fig3
+
+            fig3 = cached_figure("age_distribution", (selected_year,), build_age_chart)
             # Use a unique key for each chart based on selected_year
             chart_key = f"age_distribution_{selected_year}"
-            if "Generation" in age_year.columns:
-                fig3 = px.histogram(
-                    age_year, x="Age",
-                    y="Count",
-                    color="Generation",
-                    barmode="group",
-                    color_discrete_map=generation_colors,
-                    category_orders={"Generation": generation_order}
-                )
-            else:
-                fig3 = px.histogram(
-                    age_year,
-                    x="Age",
-                    y="Count",
-                    color_discrete_sequence=["#ADD8E6", "#00008B"]
-                )
-            fig3.update_layout(showlegend=True, margin={"l": 20, "r": 20, "t": 20, "b": 20}, height=250)
             st.plotly_chart(fig3, use_container_width=True, key=chart_key)
 
     with colB:
@@ -373,15 +399,17 @@ def render(df, df_raw, selected_year):
             else:
                 gender_counts = gender_year.groupby("Gender")["Count"].sum()
 
-                gcols = st.columns(len(gender_counts)) if len(gender_counts) > 0 else st.columns(1)
-                for i, (g, c) in enumerate(gender_counts.items()):
-                    gcols[i].markdown(f"<div class='metric-label'>{g} Employees</div><div class='metric-value'>{int(c)}</div>", unsafe_allow_html=True)
+                metric_row([(f"{g} Employees", int(c)) for g, c in gender_counts.items()], bordered=False)
 
-                gender_colors = {"Female": "#6495ED", "Male": "#00008B"}
+                def build_gender_chart():
+                    gender_colors = {"Female": "#6495ED", "Male": "#00008B"}
 
-                fig4 = px.bar(gender_year, x="Position/Level", y="Count", color="Gender",
-                              barmode="stack", color_discrete_map=gender_colors)
-                fig4.update_layout(height=250, margin={"l": 20, "r": 20, "t": 20, "b": 20})
+                    fig4 = px.bar(gender_year, x="Position/Level", y="Count", color="Gender",
+                                  barmode="stack", color_discrete_map=gender_colors)
+                    fig4.update_layout(height=250, margin={"l": 20, "r": 20, "t": 20, "b": 20})
+                    return fig4
+
+                fig4 = cached_figure("gender_diversity", (selected_year,), build_gender_chart)
                 st.plotly_chart(fig4, use_container_width=True)
 
     with colC:
@@ -391,13 +419,18 @@ def render(df, df_raw, selected_year):
             median_tenure = float(tenure_year["Tenure"].median()) if not tenure_year.empty else 0
             max_tenure = float(tenure_year["Tenure"].max()) if not tenure_year.empty else 0
 
-            t1, t2, t3 = st.columns(3)
-            t1.markdown(f"<div class='metric-label'>Average Tenure</div><div class='metric-value'>{avg_tenure} yrs</div>", unsafe_allow_html=True)
-            t2.markdown(f"<div class='metric-label'>Median Tenure</div><div class='metric-value'>{median_tenure} yrs</div>", unsafe_allow_html=True)
-            t3.markdown(f"<div class='metric-label'>Longest Tenure</div><div class='metric-value'>{max_tenure} yrs</div>", unsafe_allow_html=True)
+            metric_row([
+                ("Average Tenure", f"{avg_tenure} yrs"),
+                ("Median Tenure", f"{median_tenure} yrs"),
+                ("Longest Tenure", f"{max_tenure} yrs"),
+            ], bordered=False)
+
+            def build_tenure_chart():
+                fig5 = px.scatter(tenure_year, x="Tenure", y="Count", color="YearJoined", size="Count")
+                fig5.update_layout(height=250, margin={"l": 20, "r": 20, "t": 20, "b": 20})
+                return scale_traces(fig5)
 
-            fig5 = px.scatter(tenure_year, x="Tenure", y="Count", color="YearJoined", size="Count")
-            fig5.update_layout(height=250, margin={"l": 20, "r": 20, "t": 20, "b": 20})
+            fig5 = cached_figure("tenure_analysis", (selected_year,), build_tenure_chart)
             st.plotly_chart(fig5, use_container_width=True, key=f"tenure_analysis_{selected_year}")
 
     # Remove any duplicate/redundant chart and metric display blocks below.